@@ -28,8 +28,23 @@ bl_info = {
 }
 
 import bpy
+import hashlib
+import itertools
+import json
+import numpy as np
 import nodeitems_utils
 import os
+import platform
+import queue
+import shlex
+import statistics
+import subprocess
+import threading
+import time
+from bpy.app.handlers import persistent
+from bpy_extras.io_utils import ExportHelper
+from collections import OrderedDict
+from contextlib import ExitStack, contextmanager
 from nodeitems_utils import NodeCategory, NodeItem
 
 addon_dir = os.path.dirname(__file__)
@@ -42,16 +57,77 @@ fingerprint_textures = [
     "AperturiaFX_Smudges_Heavy.png"
 ]
 
-def on_file_load(scene):
-    ensure_aperturia_textures()
+# === METRICS ===
+# Counters and phase durations for file-load and startup work. Read them with
+# get_metrics(); set APERTURIA_METRICS_LOG or the add-on preference to also
+# append every event as a JSON line for fleet-wide aggregation.
 
-    group_missing = "Aperturia FX" not in bpy.data.node_groups
-    was_restored = check_aperturia_integrity()
+class AperturiaMetrics:
+    def __init__(self):
+        self.reset()
 
-    if group_missing and not was_restored:
-        group, node_map = create_custom_node_group()
-        if group and node_map:
-            wire_custom_node_group(group, node_map)
+    def reset(self):
+        self.counters = {}
+        self.durations = {}
+
+    def log_path(self):
+        path = os.environ.get("APERTURIA_METRICS_LOG")
+        if path:
+            return path
+        try:
+            prefs = bpy.context.preferences.addons[__name__].preferences
+        except (AttributeError, KeyError):
+            return ""
+        return bpy.path.abspath(prefs.metrics_log) if prefs.metrics_log else ""
+
+    def emit(self, event):
+        path = self.log_path()
+        if not path:
+            return
+        event = {"ts": time.time(), "host": platform.node(), "pid": os.getpid(), **event}
+        try:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(event) + "\n")
+        except OSError as e:
+            print(f"Failed to write Aperturia metrics: {path}\n{e}")
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+        self.emit({"event": "count", "name": name, "value": amount})
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            stats = self.durations.setdefault(name, {"count": 0, "total": 0.0, "last": 0.0, "max": 0.0})
+            stats["count"] += 1
+            stats["total"] += elapsed
+            stats["last"] = elapsed
+            stats["max"] = max(stats["max"], elapsed)
+            self.emit({"event": "phase", "name": name, "seconds": elapsed})
+
+    def snapshot(self):
+        return {
+            "counters": dict(self.counters),
+            "durations": {name: dict(stats) for name, stats in self.durations.items()},
+        }
+
+metrics = AperturiaMetrics()
+
+def get_metrics():
+    return metrics.snapshot()
+
+def reset_metrics():
+    metrics.reset()
+
+# Lite used to create its own copies of the shared textures
+texture_aliases = {
+    "FXL_ColorNoise": "FX_ColorNoise",
+    "FXL_CompressionNoise": "FX_CompressionNoise",
+}
 
 # === TEXTURE SETUP ===
 
@@ -97,6 +173,8 @@ def load_image(filename):
     try:
         image = bpy.data.images.load(image_path)
         image.source = 'FILE'
+        metrics.count("images_loaded")
+        metrics.count("image_bytes_loaded", os.path.getsize(image_path))
         return image
     except Exception as e:
         print(f"Failed to load image: {filename}\n{e}")
@@ -104,45 +182,195 @@ def load_image(filename):
 
 def bulk_load_images():
     loaded = {}
-    for filename in fingerprint_textures:
-        img = load_image(filename)
-        if img:
-            loaded[filename] = img
+    with metrics.phase("bulk_load_images"):
+        for filename in fingerprint_textures:
+            img = load_image(filename)
+            if img:
+                loaded[filename] = img
     return loaded
 
-def ensure_aperturia_textures():
-    if "FX_ColorNoise" not in bpy.data.textures or bpy.data.textures["FX_ColorNoise"].type != 'DISTORTED_NOISE':
-        reset_color_noise_texture()
-    if "FX_CompressionNoise" not in bpy.data.textures:
-        bpy.data.textures.new(name="FX_CompressionNoise", type='NOISE')
+def merge_texture_aliases():
+    for alias, name in texture_aliases.items():
+        tex = bpy.data.textures.get(alias)
+        target = bpy.data.textures.get(name)
+        if tex and target:
+            tex.user_remap(target)
+            bpy.data.textures.remove(tex)
 
-    # Load fingerprint/smudge images
-    bulk_load_images()
-
-def check_aperturia_integrity():
+def ensure_aperturia_textures():
     restored = False
 
     if "FX_ColorNoise" not in bpy.data.textures or bpy.data.textures["FX_ColorNoise"].type != 'DISTORTED_NOISE':
         print("Restoring FX_ColorNoise...")
         reset_color_noise_texture()
+        metrics.count("restore_events")
         restored = True
 
     if "FX_CompressionNoise" not in bpy.data.textures:
         print("Restoring FX_CompressionNoise...")
         bpy.data.textures.new(name="FX_CompressionNoise", type='NOISE')
+        metrics.count("restore_events")
         restored = True
 
-    if "Aperturia FX" not in bpy.data.node_groups:
-        print("Rebuilding Aperturia FX node group...")
-        group, node_map = create_custom_node_group()
-        if group and node_map:
-            wire_custom_node_group(group, node_map)
-            restored = True
-            
+    merge_texture_aliases()
+
+    if COLOR_NOISE_IMAGE not in bpy.data.images:
+        # Placeholder until the first bake
+        bpy.data.images.new(COLOR_NOISE_IMAGE, 4, 4, float_buffer=True)
+    try:
+        bake_color_noise()
+    except Exception as e:
+        print(f"Aperturia color noise bake failed: {e}")
+
+    # Load fingerprint/smudge images
     bulk_load_images()
 
     return restored
 
+def build_aperturia_group():
+    group, node_map = create_custom_node_group()
+    if group and node_map:
+        wire_custom_node_group(group, node_map)
+        metrics.count("nodes_created", len(group.nodes))
+        metrics.count("links_created", len(group.links))
+        sync_color_noise_field(group)
+        settings = stored_quality_settings()
+        if settings:
+            apply_quality_settings(settings, group)
+        return True
+    return False
+
+def check_aperturia_integrity():
+    return AperturiaRuntime.shared().check_all()
+
+# === SHARED RUNTIME ===
+# Aperturia FX and Aperturia FX Lite register their node groups here instead of
+# installing their own load_post handlers and timers. The runtime lives in
+# bpy.app.driver_namespace so both add-ons find the same instance, and each file
+# load or rebuild handles the shared textures and images exactly once.
+#
+# A front-end joins with:
+#     AperturiaRuntime.shared().register_frontend("Aperturia FX Lite", "Aperturia FX Lite", build_fn, ensure_fn)
+# where build_fn() creates and wires its group and returns True on success, and
+# ensure_fn() restores the textures it needs. A front-end that keeps metrics
+# passes its recorder as the optional last argument. Lite carries an identical
+# copy of the class so it works on its own. Whichever add-on registers first
+# creates the instance, and an add-on carrying a newer VERSION takes it over,
+# so an older install of either add-on never decides how the other behaves.
+
+RUNTIME_KEY = "aperturia_runtime"
+
+class AperturiaRuntime:
+    # Bump on any change to this class, in both add-ons
+    VERSION = 2
+
+    def __init__(self):
+        self.frontends = {}
+        self.load_handler = self.on_file_load
+        self.rebuild_timer = self.rebuild
+
+    @classmethod
+    def shared(cls):
+        runtime = bpy.app.driver_namespace.get(RUNTIME_KEY)
+        if runtime is None:
+            runtime = bpy.app.driver_namespace[RUNTIME_KEY] = cls()
+        elif getattr(runtime, "VERSION", 1) < cls.VERSION:
+            runtime = cls.take_over(runtime)
+        return runtime
+
+    @classmethod
+    def take_over(cls, old):
+        # Moves the front-ends, file-load handler and pending rebuild of an
+        # older instance onto this class
+        runtime = cls()
+        for name, frontend in old.frontends.items():
+            runtime.frontends[name] = {"metrics": None, **frontend}
+        if old.load_handler in bpy.app.handlers.load_post:
+            bpy.app.handlers.load_post.remove(old.load_handler)
+            bpy.app.handlers.load_post.append(runtime.load_handler)
+        if bpy.app.timers.is_registered(old.rebuild_timer):
+            bpy.app.timers.unregister(old.rebuild_timer)
+            runtime.schedule_rebuild()
+        bpy.app.driver_namespace[RUNTIME_KEY] = runtime
+        return runtime
+
+    def register_frontend(self, name, group_name, build, textures=None, metrics=None):
+        self.frontends[name] = {"group_name": group_name, "build": build, "textures": textures, "metrics": metrics}
+        if self.load_handler not in bpy.app.handlers.load_post:
+            bpy.app.handlers.load_post.append(self.load_handler)
+        self.schedule_rebuild()
+
+    def unregister_frontend(self, name):
+        self.frontends.pop(name, None)
+        if self.frontends:
+            return
+        if self.load_handler in bpy.app.handlers.load_post:
+            bpy.app.handlers.load_post.remove(self.load_handler)
+        if bpy.app.timers.is_registered(self.rebuild_timer):
+            bpy.app.timers.unregister(self.rebuild_timer)
+        bpy.app.driver_namespace.pop(RUNTIME_KEY, None)
+
+    def ensure_textures(self):
+        # Hooks only create what is missing, so running each once is enough
+        restored = False
+        hooks = []
+        for frontend in self.frontends.values():
+            if frontend["textures"] and frontend["textures"] not in hooks:
+                hooks.append(frontend["textures"])
+        for hook in hooks:
+            restored = hook() or restored
+        return restored
+
+    def recorders(self):
+        # Metrics are kept by the front-ends, so they are recorded whichever
+        # add-on created this instance
+        found = []
+        for frontend in self.frontends.values():
+            recorder = frontend.get("metrics")
+            if recorder is not None and recorder not in found:
+                found.append(recorder)
+        return found
+
+    @contextmanager
+    def phase(self, name):
+        with ExitStack() as stack:
+            for recorder in self.recorders():
+                stack.enter_context(recorder.phase(name))
+            yield
+
+    def count(self, name):
+        for recorder in self.recorders():
+            recorder.count(name)
+
+    def check_all(self):
+        with self.phase("check_aperturia_integrity"):
+            restored = self.ensure_textures()
+            for name, frontend in self.frontends.items():
+                if frontend["group_name"] not in bpy.data.node_groups:
+                    print(f"Rebuilding {name} node group...")
+                    self.count("restore_events")
+                    restored = frontend["build"]() or restored
+        return restored
+
+    @persistent
+    def on_file_load(self, scene):
+        with self.phase("on_file_load"):
+            self.check_all()
+
+    def schedule_rebuild(self):
+        # Front-ends enabled together share one deferred rebuild
+        if not bpy.app.timers.is_registered(self.rebuild_timer):
+            bpy.app.timers.register(self.rebuild_timer, first_interval=1.0)
+
+    def rebuild(self):
+        with self.phase("deferred_node_group_build"):
+            self.ensure_textures()
+            for frontend in self.frontends.values():
+                if frontend["group_name"] in bpy.data.node_groups:
+                    bpy.data.node_groups.remove(bpy.data.node_groups[frontend["group_name"]])
+                frontend["build"]()
+        return None
+
 # === NODE GROUP BUILDER ===
 def create_custom_node_group():
     group_name = "Aperturia FX"
@@ -251,16 +479,23 @@ def create_custom_node_group():
     cc = new("Color Correction", "CompositorNodeColorCorrection", -80, 460)
     cc.shadows_contrast = 0.95; cc.master_gamma = 0.7
     math_divide = new("Math", "CompositorNodeMath", -330, -545); math_divide.operation = 'DIVIDE'; math_divide.inputs[1].default_value = 100.0
+    # Clamped to 1.0: scaling up and then back down to render size is the same resample
+    # as going to render size directly, but it allocated an Image Scale x larger buffer
+    math_divide.use_clamp = True
     scale_rel = new("Scale", "CompositorNodeScale", 1365, 140)
     scale_render = new("Scale.001", "CompositorNodeScale", 1560, 140); scale_render.space = 'RENDER_SIZE'; scale_render.frame_method = 'STRETCH'
     alpha_over = new("Alpha Over - DSLR", "CompositorNodeAlphaOver", 1880, 235); alpha_over.inputs[0].default_value = 0.002
     pixelate = new("Pixelate", "CompositorNodePixelate", 1360, 330); pixelate.pixel_size = 3
 
-    texture_cn = new("FX_ColorNoise", "CompositorNodeTexture", -1200, 710); texture_cn.texture = bpy.data.textures.get("FX_ColorNoise")
-    blur_cn = new("Blur.001", "CompositorNodeBlur", -890, 710)
-    blur_cn.use_variable_size = True
-    blur_cn.size_x = 3
-    blur_cn.size_y = 3
+    # Color noise is baked over the largest scale in use (see bake_color_noise).
+    # ColorNoiseView zooms into this instance's [-scale, scale] part, and its
+    # bilinear upsample replaces the old 3px softening blur
+    image_cn = new("FX_ColorNoise", "CompositorNodeImage", -1200, 710); image_cn.image = bpy.data.images.get(COLOR_NOISE_IMAGE)
+    scale_cn = new("ColorNoiseUp", "CompositorNodeScale", -1030, 710); scale_cn.space = 'RENDER_SIZE'; scale_cn.frame_method = 'STRETCH'
+    view_cn = new("ColorNoiseView", "CompositorNodeTransform", -860, 710); view_cn.filter_type = 'BILINEAR'
+    field_cn = new("ColorNoiseField", "CompositorNodeValue", -1370, 900); field_cn.outputs[0].default_value = 100.0
+    min_cn = new("ColorNoiseMin", "CompositorNodeMath", -1200, 900); min_cn.operation = 'MAXIMUM'; min_cn.inputs[1].default_value = 0.001
+    zoom_cn = new("ColorNoiseZoom", "CompositorNodeMath", -1030, 900); zoom_cn.operation = 'DIVIDE'
     texture_comp = new("FX_CompressionNoise", "CompositorNodeTexture", 980, 570); texture_comp.texture = bpy.data.textures.get("FX_CompressionNoise")
     map_value = new("Map Value", "CompositorNodeMapValue", 700, 860)    
 
@@ -273,12 +508,8 @@ def create_custom_node_group():
     blur2.use_variable_size = True
     blur2.size_x = 250
     blur2.size_y = 250
-    blur3 = new("Blur.003", "CompositorNodeBlur", 615, -1420)
-    blur3.filter_type = 'GAUSS'
-    blur3.use_variable_size = True
-    blur3.size_x = 3
-    blur3.size_y = 3
-    blur3.use_extended_bounds = True
+    scale_cn_up = new("ColorNoiseUp.100", "CompositorNodeScale", 615, -1420); scale_cn_up.space = 'RENDER_SIZE'; scale_cn_up.frame_method = 'STRETCH'
+    view_cn_up = new("ColorNoiseView.100", "CompositorNodeTransform", 785, -1420); view_cn_up.filter_type = 'BILINEAR'
     denoise21 = new("Denoise.100", "CompositorNodeDenoise", -3395, -1110)
     glare2 = new("Glare.100", "CompositorNodeGlare", -3075, -1150); glare2.glare_type = "BLOOM"; glare2.quality = 'HIGH'; glare2.inputs["Threshold"].default_value = 25; glare2.inputs["Smoothness"].default_value = 1.0; glare2.inputs["Maximum"].default_value = 50.0; glare2.inputs["Size"].default_value = 0.5; glare2.inputs["Strength"].default_value = 0.1
     ld_10 = new("Lens Distortion.100", "CompositorNodeLensdist", -2885, -1120); ld_10.use_jitter = True; ld_10.use_fit = True
@@ -315,15 +546,19 @@ def create_custom_node_group():
     hsv_0 = new("HSV", "CompositorNodeHueSat", -2050, -790); hsv_0.inputs[2].default_value = 0.0
     hsv_1 = new("HSV.001", "CompositorNodeHueSat", -125, -1000); hsv_1.inputs[3].default_value = 1.25
     pixelate_1 = new("Pixelate.100", "CompositorNodePixelate", -830, -1110); pixelate_1.pixel_size = 2
-    pixelate_2 = new("Pixelate.101", "CompositorNodePixelate", 1020, -780); pixelate_2.pixel_size = 10
-    pixelate_3 = new("Pixelate.102", "CompositorNodePixelate", 1020, -900); pixelate_3.pixel_size = 5
+    # Compression blocks are built in the 5px block domain: one value per block,
+    # Pixelate 2 there gives the 10px blocks, then a single upsample at the end
+    scale_blocks_1 = new("Scale.102", "CompositorNodeScale", 850, -860)
+    scale_blocks_1.inputs[1].default_value = 0.2; scale_blocks_1.inputs[2].default_value = 0.2
+    pixelate_2 = new("Pixelate.101", "CompositorNodePixelate", 1020, -780); pixelate_2.pixel_size = 2
+    scale_blocks_1_up = new("Scale.103", "CompositorNodeScale", 1530, -835); scale_blocks_1_up.space = 'RENDER_SIZE'; scale_blocks_1_up.frame_method = 'STRETCH'
     invert_color = new("Invert Color", "CompositorNodeInvert", -1385, -1320)
-    math_divide_1 = new("Math.100", "CompositorNodeMath", 1465, -1565); math_divide_1.operation = 'DIVIDE'; math_divide_1.inputs[1].default_value = 100.0
+    math_divide_1 = new("Math.100", "CompositorNodeMath", 1465, -1565); math_divide_1.operation = 'DIVIDE'; math_divide_1.inputs[1].default_value = 100.0; math_divide_1.use_clamp = True
     scale_rel_1 = new("Scale.100", "CompositorNodeScale", 2160, -1055)
     scale_render_1 = new("Scale.101", "CompositorNodeScale", 2355, -1055); scale_render_1.space = 'RENDER_SIZE'; scale_render_1.frame_method = 'STRETCH'
     cc_1 = new("Color Correction.100", "CompositorNodeColorCorrection", 1020, -1160); cc_1.highlights_lift = -0.02; cc_1.highlights_contrast = 2.0; cc_1.master_contrast = 1.005; cc_1.shadows_lift = 0.01
     texture_comp_1 = new("FX_CompressionNoise.100", "CompositorNodeTexture", 525, -855); texture_comp_1.texture = bpy.data.textures.get("FX_CompressionNoise")
-    texture_cn_2 = new("FX_ColorNoise.100", "CompositorNodeTexture", 280, -1585); texture_cn_2.texture = bpy.data.textures.get("FX_ColorNoise")
+    image_cn_2 = new("FX_ColorNoise.100", "CompositorNodeImage", 280, -1585); image_cn_2.image = bpy.data.images.get(COLOR_NOISE_IMAGE)
     map_value_1 = new("Map Value.100", "CompositorNodeMapValue", 305, -860)
     alpha_over_1 = new("Alpha Over - Camcorder", "CompositorNodeAlphaOver", 2620, -800); alpha_over_1.inputs[0].default_value = 0.002
     
@@ -332,6 +567,7 @@ def create_custom_node_group():
     math_divide_200 = new("Math.200", "CompositorNodeMath", -4350, -2210)
     math_divide_200.operation = 'DIVIDE'
     math_divide_200.inputs[1].default_value = 100.0
+    math_divide_200.use_clamp = True  # downscale only, see "Math"
 
     scale_200 = new("Scale.200", "CompositorNodeScale", -4080, -2170)
     scale_200.space = 'RELATIVE'
@@ -420,15 +656,14 @@ def create_custom_node_group():
     ld_203 = new("Lens Distortion.203", "CompositorNodeLensdist", -520, -2525)
     ld_203.use_fit = True
 
-    blur_202 = new("Blur.202", "CompositorNodeBlur", -30, -2495)
-    blur_202.filter_type = 'GAUSS'
-    blur_202.use_variable_size = True
-    blur_202.use_extended_bounds = True
-    blur_202.size_x = 3
-    blur_202.size_y = 3
+    scale_cn_200 = new("ColorNoiseUp.200", "CompositorNodeScale", -30, -2495)
+    scale_cn_200.space = 'RENDER_SIZE'
+    scale_cn_200.frame_method = 'STRETCH'
+    view_cn_200 = new("ColorNoiseView.200", "CompositorNodeTransform", 110, -2495)
+    view_cn_200.filter_type = 'BILINEAR'
 
-    texture_200 = new("FX_ColorNoise.200", "CompositorNodeTexture", -340, -2585)
-    texture_200.texture = bpy.data.textures.get("FX_ColorNoise")
+    image_cn_200 = new("FX_ColorNoise.200", "CompositorNodeImage", -340, -2585)
+    image_cn_200.image = bpy.data.images.get(COLOR_NOISE_IMAGE)
 
     mix_overlay_200 = new("Mix.204", "CompositorNodeMixRGB", 260, -2330)
     mix_overlay_200.blend_type = 'OVERLAY'
@@ -450,15 +685,21 @@ def create_custom_node_group():
     scale_render_200.space = 'RENDER_SIZE'
     scale_render_200.frame_method = 'STRETCH'
 
-    pixelate_200 = new("Pixelate.200", "CompositorNodePixelate", 850, -2550)
-    pixelate_200.pixel_size = 50  # Image shows large block size for pixelation
+    # Compression look in the 50px block domain: downsample to one value per block,
+    # blur one block wide, upsample once. Replaces Pixelate 50 + a 50x50 Gauss at full res
+    scale_blocks_200 = new("Scale.202", "CompositorNodeScale", 850, -2550)
+    scale_blocks_200.inputs[1].default_value = 0.02
+    scale_blocks_200.inputs[2].default_value = 0.02
     
     blur_204 = new("Blur.204", "CompositorNodeBlur", 1020, -2570)
     blur_204.filter_type = 'GAUSS'
     blur_204.use_variable_size = True
-    blur_204.use_extended_bounds = True
-    blur_204.size_x = 50
-    blur_204.size_y = 50
+    blur_204.size_x = 1
+    blur_204.size_y = 1
+
+    scale_blocks_200_up = new("Scale.203", "CompositorNodeScale", 1180, -2570)
+    scale_blocks_200_up.space = 'RENDER_SIZE'
+    scale_blocks_200_up.frame_method = 'STRETCH'
 
     # === DSLR Smoothstep Fake ===
     pres1_sub = new("Pres1_Sub", "CompositorNodeMath", 2285, 265); pres1_sub.operation = 'SUBTRACT'; pres1_sub.inputs[1].default_value = 0.4
@@ -548,6 +789,12 @@ def create_custom_node_group():
     smudge_heavy_scaler = new("SmuHeavyScale", "CompositorNodeScale", 5050, -20)
     smudge_heavy_scaler.space = 'RENDER_SIZE'
     smudge_heavy_scaler.frame_method = 'CROP'
+
+    # Offsets the overlays onto a cropped border region (see sync_render_region)
+    new("FinLightShift", "CompositorNodeTranslate", 4420, -255)
+    new("FinHeavyShift", "CompositorNodeTranslate", 4420, -30)
+    new("SmuLightShift", "CompositorNodeTranslate", 5150, -225)
+    new("SmuHeavyShift", "CompositorNodeTranslate", 5160, -20)
     
     finger_leveler = new("FingerLeveler", "CompositorNodeMixRGB", 4560, -320)
     finger_leveler.blend_type = 'ADD'
@@ -604,9 +851,13 @@ def wire_custom_node_group(group, node_map):
     # Color noise overlay
     link.new(node_map["Lens Distortion.004"].outputs[0], node_map["Mix.004"].inputs[1])
     link.new(gi["Color Noise intensity"], node_map["Mix.004"].inputs[0])
-    link.new(gi["Color Noise scale"], node_map["FX_ColorNoise"].inputs[1])
-    link.new(node_map["FX_ColorNoise"].outputs[1], node_map["Blur.001"].inputs[0])
-    link.new(node_map["Blur.001"].outputs[0], node_map["Mix.004"].inputs[2])
+    link.new(gi["Color Noise scale"], node_map["ColorNoiseMin"].inputs[0])
+    link.new(node_map["ColorNoiseField"].outputs[0], node_map["ColorNoiseZoom"].inputs[0])
+    link.new(node_map["ColorNoiseMin"].outputs[0], node_map["ColorNoiseZoom"].inputs[1])
+    link.new(node_map["FX_ColorNoise"].outputs[0], node_map["ColorNoiseUp"].inputs[0])
+    link.new(node_map["ColorNoiseUp"].outputs[0], node_map["ColorNoiseView"].inputs["Image"])
+    link.new(node_map["ColorNoiseZoom"].outputs[0], node_map["ColorNoiseView"].inputs["Scale"])
+    link.new(node_map["ColorNoiseView"].outputs[0], node_map["Mix.004"].inputs[2])
 
     # Shadow contrast & denoise
     link.new(node_map["Mix.004"].outputs[0], node_map["Color Correction"].inputs[0])
@@ -679,11 +930,12 @@ def wire_custom_node_group(group, node_map):
     link.new(node_map["Mix.103"].outputs[0], node_map["Mix.105"].inputs[1])
     link.new(gi["General Noise"], node_map["Mix.105"].inputs[0])
     
-    link.new(gi["Color Noise scale"], node_map["FX_ColorNoise.100"].inputs[1])
-    link.new(node_map["FX_ColorNoise.100"].outputs[1], node_map["Blur.003"].inputs[0])
+    link.new(node_map["FX_ColorNoise.100"].outputs[0], node_map["ColorNoiseUp.100"].inputs[0])
+    link.new(node_map["ColorNoiseUp.100"].outputs[0], node_map["ColorNoiseView.100"].inputs["Image"])
+    link.new(node_map["ColorNoiseZoom"].outputs[0], node_map["ColorNoiseView.100"].inputs["Scale"])
     link.new(gi["Color Noise intensity"], node_map["Mix.109"].inputs[0])
     link.new(node_map["Mix.105"].outputs[0], node_map["Mix.109"].inputs[1])
-    link.new(node_map["Blur.003"].outputs[0], node_map["Mix.109"].inputs[2])
+    link.new(node_map["ColorNoiseView.100"].outputs[0], node_map["Mix.109"].inputs[2])
     link.new(node_map["Mix.109"].outputs[0], node_map["Color Correction.100"].inputs[0])
     link.new(node_map["Mix.109"].outputs[0], node_map["Mix.107"].inputs[2])
     link.new(node_map["Color Correction.100"].outputs[0], node_map["Mix.107"].inputs[1])
@@ -698,11 +950,12 @@ def wire_custom_node_group(group, node_map):
     link.new(node_map["Scale.100"].outputs[0], node_map["Scale.101"].inputs[0])
     
     link.new(node_map["Map Value.100"].outputs[0], node_map["FX_CompressionNoise.100"].inputs[0])
-    link.new(node_map["FX_CompressionNoise.100"].outputs[0], node_map["Pixelate.101"].inputs[0])
-    link.new(node_map["FX_CompressionNoise.100"].outputs[0], node_map["Pixelate.102"].inputs[0])
+    link.new(node_map["FX_CompressionNoise.100"].outputs[0], node_map["Scale.102"].inputs[0])
+    link.new(node_map["Scale.102"].outputs[0], node_map["Pixelate.101"].inputs[0])
     link.new(node_map["Pixelate.101"].outputs[0], node_map["Mix.106"].inputs[1])
-    link.new(node_map["Pixelate.102"].outputs[0], node_map["Mix.106"].inputs[2])
-    link.new(node_map["Mix.106"].outputs[0], node_map["Alpha Over - Camcorder"].inputs[2])
+    link.new(node_map["Scale.102"].outputs[0], node_map["Mix.106"].inputs[2])
+    link.new(node_map["Mix.106"].outputs[0], node_map["Scale.103"].inputs[0])
+    link.new(node_map["Scale.103"].outputs[0], node_map["Alpha Over - Camcorder"].inputs[2])
     link.new(node_map["Scale.101"].outputs[0], node_map["Alpha Over - Camcorder"].inputs[1])
     
     link.new(gi["Compression Noise intensity"], node_map["Alpha Over - Camcorder"].inputs[0])
@@ -757,9 +1010,10 @@ def wire_custom_node_group(group, node_map):
     link.new(gi["Lens Dispersion"], node_map["Lens Distortion.202"].inputs[2])
     
     link.new(node_map["Lens Distortion.202"].outputs[0], node_map["Mix.204"].inputs[1])
-    link.new(gi["Color Noise scale"], node_map["FX_ColorNoise.200"].inputs[1])
-    link.new(node_map["FX_ColorNoise.200"].outputs[1], node_map["Blur.202"].inputs[0])
-    link.new(node_map["Blur.202"].outputs[0], node_map["Mix.204"].inputs[2])
+    link.new(node_map["FX_ColorNoise.200"].outputs[0], node_map["ColorNoiseUp.200"].inputs[0])
+    link.new(node_map["ColorNoiseUp.200"].outputs[0], node_map["ColorNoiseView.200"].inputs["Image"])
+    link.new(node_map["ColorNoiseZoom"].outputs[0], node_map["ColorNoiseView.200"].inputs["Scale"])
+    link.new(node_map["ColorNoiseView.200"].outputs[0], node_map["Mix.204"].inputs[2])
     link.new(gi["Color Noise intensity"], node_map["Mix.204"].inputs[0])
     
     link.new(gi["General Noise"], node_map["Mix.205"].inputs[0])
@@ -767,10 +1021,11 @@ def wire_custom_node_group(group, node_map):
     link.new(node_map["Lens Distortion.203"].outputs[0], node_map["Mix.205"].inputs[2])
     
     link.new(node_map["Map Value.200"].outputs[0], node_map["FX_CompressionNoise.200"].inputs[1])
-    link.new(node_map["FX_CompressionNoise.200"].outputs[0], node_map["Pixelate.200"].inputs[0])
+    link.new(node_map["FX_CompressionNoise.200"].outputs[0], node_map["Scale.202"].inputs[0])
     link.new(node_map["FX_CompressionNoise.200"].outputs[0], node_map["Mix.206"].inputs[2])
-    link.new(node_map["Pixelate.200"].outputs[0], node_map["Blur.204"].inputs[0])
-    link.new(node_map["Blur.204"].outputs[0], node_map["Mix.206"].inputs[1])
+    link.new(node_map["Scale.202"].outputs[0], node_map["Blur.204"].inputs[0])
+    link.new(node_map["Blur.204"].outputs[0], node_map["Scale.203"].inputs[0])
+    link.new(node_map["Scale.203"].outputs[0], node_map["Mix.206"].inputs[1])
     
     link.new(node_map["Mix.205"].outputs[0], node_map["Alpha Over - Retro"].inputs[1])
     link.new(node_map["Mix.206"].outputs[0], node_map["Alpha Over - Retro"].inputs[2])
@@ -832,10 +1087,15 @@ def wire_custom_node_group(group, node_map):
     link.new(gi["Fingerprint level"], node_map["FingerLeveler"].inputs[0])
     link.new(gi["Smudge level"], node_map["SmudgeLeveler"].inputs[0])
     
-    link.new(node_map["FinLightScale"].outputs[0], node_map["FingerLeveler"].inputs[1])
-    link.new(node_map["FinHeavyScale"].outputs[0], node_map["FingerLeveler"].inputs[2])
-    link.new(node_map["SmuLightScale"].outputs[0], node_map["SmudgeLeveler"].inputs[1])
-    link.new(node_map["SmuHeavyScale"].outputs[0], node_map["SmudgeLeveler"].inputs[2])
+    link.new(node_map["FinLightScale"].outputs[0], node_map["FinLightShift"].inputs[0])
+    link.new(node_map["FinHeavyScale"].outputs[0], node_map["FinHeavyShift"].inputs[0])
+    link.new(node_map["SmuLightScale"].outputs[0], node_map["SmuLightShift"].inputs[0])
+    link.new(node_map["SmuHeavyScale"].outputs[0], node_map["SmuHeavyShift"].inputs[0])
+
+    link.new(node_map["FinLightShift"].outputs[0], node_map["FingerLeveler"].inputs[1])
+    link.new(node_map["FinHeavyShift"].outputs[0], node_map["FingerLeveler"].inputs[2])
+    link.new(node_map["SmuLightShift"].outputs[0], node_map["SmudgeLeveler"].inputs[1])
+    link.new(node_map["SmuHeavyShift"].outputs[0], node_map["SmudgeLeveler"].inputs[2])
     
     link.new(gi["Fingerprint intensity"], node_map["FingerIntensity"].inputs[0])
     link.new(node_map["CamStack_2"].outputs[0], node_map["FingerIntensity"].inputs[1])
@@ -855,34 +1115,1967 @@ def wire_custom_node_group(group, node_map):
     fcurve.driver.expression = "frame"
     fcurve = node_map["Map Value.200"].inputs[0].driver_add("default_value")
     fcurve.driver.expression = "frame"
-    
+
+# === GROUP INSTANCE HELPERS ===
+
+def find_aperturia_node(scene):
+    tree = scene.node_tree if scene.use_nodes else None
+    if tree is None:
+        return None
+    for node in tree.nodes:
+        if node.bl_idname == "CompositorNodeGroup" and node.node_tree and node.node_tree.name == "Aperturia FX":
+            return node
+    return None
+
+def group_is_wired(scene, node=None):
+    # The compositor already applies the look, post passes must not repeat it
+    node = node or find_aperturia_node(scene)
+    return bool(node and node.outputs[0].is_linked and scene.render.use_compositing)
+
+def render_size(scene):
+    render = scene.render
+    pct = render.resolution_percentage / 100.0
+    return max(1, int(render.resolution_x * pct)), max(1, int(render.resolution_y * pct))
+
+def render_region(scene):
+    render = scene.render
+    if not render.use_border:
+        return None
+    full_w, full_h = render_size(scene)
+    x0, x1 = int(render.border_min_x * full_w), int(render.border_max_x * full_w)
+    y0, y1 = int(render.border_min_y * full_h), int(render.border_max_y * full_h)
+    if x1 <= x0 or y1 <= y0:
+        return None
+    return {"rect": (x0, y0, x1, y1), "size": (full_w, full_h)}
+
+overlay_scalers = (
+    ("Fingerprints_Light", "FinLightScale", "FinLightShift"),
+    ("Fingerprints_Heavy", "FinHeavyScale", "FinHeavyShift"),
+    ("Smudge_Light", "SmuLightScale", "SmuLightShift"),
+    ("Smudge_Heavy", "SmuHeavyScale", "SmuHeavyShift"),
+)
+
+def render_region_warning(scene):
+    render = scene.render
+    if not render.use_border:
+        return None
+    if not render.use_crop_to_border:
+        return "Enable Crop to Render Region to composite only the region"
+    params = group_parameters(scene)
+    if params.get("Lens Distortion", 0.0) != 0.0 or params.get("Lens Dispersion", 0.0) != 0.0:
+        return "Lens distortion and dispersion are centred on the crop and not supported for region renders"
+    return None
+
+def sync_render_region(scene):
+    # With "Crop to Render Region" the compositor only evaluates the region,
+    # so full-frame masks and overlays are re-expressed in region coordinates
+    # for the duration of the render (see on_render_post).
+    # Lens distortion is out of scope here: the Lens Distortion node has no
+    # centre input and pulls pixels from outside the region, which a cropped
+    # render never produces, so no margin can be added after the fact. Crop
+    # renders with distortion or dispersion are warned about, and full frames
+    # (or Distortion and Dispersion at 0) are needed for matching patches.
+    region = render_region(scene) if scene.render.use_crop_to_border else None
+    if region:
+        warning = render_region_warning(scene)
+        if warning:
+            print(f"Aperturia FX: {warning}.")
+    set_render_region(region)
+
+def set_render_region(region, group=None):
+    # region=None puts the group back to its full-frame layout
+    group = group or bpy.data.node_groups.get("Aperturia FX")
+    if group is None:
+        return
+
+    if region:
+        full_w, full_h = region["size"]
+        x0, y0, x1, y1 = region["rect"]
+        bw, bh = (x1 - x0) / full_w, (y1 - y0) / full_h
+        bx, by = x0 / full_w, y0 / full_h
+        cx, cy = (x0 + x1) * 0.5 / full_w, (y0 + y1) * 0.5 / full_h
+
+    for name in ("Ellipse Mask", "Ellipse Mask.001", "Ellipse Mask.200"):
+        mask = group.nodes.get(name)
+        if mask is None:
+            continue
+        if region:
+            mask.x, mask.y = (0.5 - bx) / bw, (0.5 - by) / bh
+            mask.mask_width, mask.mask_height = 1.0 / bw, 0.75 / bw
+        else:
+            mask.x, mask.y = 0.5, 0.5
+            mask.mask_width, mask.mask_height = 1.0, 0.75
+
+    for image_name, scale_name, shift_name in overlay_scalers:
+        image_node = group.nodes.get(image_name)
+        scaler = group.nodes.get(scale_name)
+        shift = group.nodes.get(shift_name)
+        if scaler is None or shift is None:
+            continue
+        image = image_node.image if image_node else None
+        if region and image and image.size[0] and image.size[1]:
+            # Same cover fit as RENDER_SIZE/CROP, but against the full frame
+            cover = max(full_w / image.size[0], full_h / image.size[1])
+            scaler.space = 'RELATIVE'
+            scaler.inputs["X"].default_value = cover
+            scaler.inputs["Y"].default_value = cover
+            shift.inputs["X"].default_value = (0.5 - cx) * full_w
+            shift.inputs["Y"].default_value = (0.5 - cy) * full_h
+        else:
+            scaler.space = 'RENDER_SIZE'
+            scaler.frame_method = 'CROP'
+            shift.inputs["X"].default_value = 0.0
+            shift.inputs["Y"].default_value = 0.0
+
+# === COLOR NOISE BAKE ===
+# FX_ColorNoise is evaluated once into a packed image instead of per output
+# pixel on every frame. The image covers the texture over [-S, S], where S is
+# the largest "Color Noise scale" any instance reaches (keyframes included);
+# ColorNoiseView in the group zooms each instance into its own [-scale, scale]
+# part, so per-instance and animated values keep working.
+#
+# Every cell holds the texture averaged over the cell, sampled once per output
+# pixel of the finest instance the way the Texture node did, so sub-pixel
+# blotches average out like they did under the old 3px blur. Cells are 3 output
+# pixels wide, or half a blotch once blotches are larger than that. The texture
+# is evaluated by the compositor in a scratch scene, in tiles, and only ever
+# from the main thread (file load, rebuilds and a debounced timer), never from
+# a render handler. The result is packed into the .blend and only re-baked
+# when its key changes.
+
+COLOR_NOISE_IMAGE = "AperturiaFX_ColorNoise"
+COLOR_NOISE_SCENE = "AperturiaFX_ColorNoiseBake"
+COLOR_NOISE_CELL_PX = 3
+COLOR_NOISE_MAX_CELLS = 2048  # per axis
+COLOR_NOISE_TILE = 2048       # texture samples per axis in one bake render
+
+def color_noise_scales():
+    # Every "Color Noise scale" the instances reach, plus the largest render size
+    scales, width, height = [], 1, 1
+    for scene in bpy.data.scenes:
+        if scene.name in (COLOR_NOISE_SCENE, BENCH_SCENE) or not scene.use_nodes or scene.node_tree is None:
+            continue
+        anim = scene.node_tree.animation_data
+        action = anim.action if anim else None
+        used = False
+        for node in scene.node_tree.nodes:
+            if not (node.bl_idname == "CompositorNodeGroup" and node.node_tree and node.node_tree.name == "Aperturia FX"):
+                continue
+            for i, sock in enumerate(node.inputs):
+                if sock.name != "Color Noise scale":
+                    continue
+                used = True
+                scales.append(float(sock.default_value))
+                fcurve = action.fcurves.find(f'nodes["{node.name}"].inputs[{i}].default_value') if action else None
+                if fcurve:
+                    # A Bezier segment stays inside its keys and handles
+                    for key in fcurve.keyframe_points:
+                        scales.extend((key.co[1], key.handle_left[1], key.handle_right[1]))
+        if used:
+            w, h = render_size(scene)
+            width, height = max(width, w), max(height, h)
+    return scales, width, height
+
+def color_noise_layout(scales, noise_scale, width, height):
+    # Field half-size, cells per axis and texture samples per cell per axis
+    scales = [min(max(scale, 1e-3), 100.0) for scale in scales] or [100.0]
+    outer, inner = max(scales), min(scales)
+    cells, per_cell = [], []
+    for size in (width, height):
+        # Output pixel of the finest and the widest instance, in texture units
+        pixel = 2.0 * inner / size
+        cell = max(COLOR_NOISE_CELL_PX * pixel, 0.5 * noise_scale, 2.0 * outer / size)
+        count = min(max(int(np.ceil(2.0 * outer / cell)), 4), COLOR_NOISE_MAX_CELLS)
+        # A handful of samples per blotch is enough to average it
+        spacing = max(pixel, 0.25 * noise_scale)
+        cells.append(count)
+        per_cell.append(max(1, min(int(round(2.0 * outer / count / spacing)), COLOR_NOISE_TILE)))
+    return {"field": outer, "cells": tuple(cells), "per_cell": tuple(per_cell)}
+
+def color_noise_inputs(tex):
+    scales, width, height = color_noise_scales()
+    return scales, tex.noise_scale, width, height
+
+def color_noise_key(layout=None):
+    tex = bpy.data.textures.get("FX_ColorNoise")
+    if tex is None:
+        return None
+    layout = layout or color_noise_layout(*color_noise_inputs(tex))
+    ramp = [(e.position, tuple(e.color)) for e in tex.color_ramp.elements] if tex.use_color_ramp else []
+    state = [round(layout["field"], 4), layout["cells"], layout["per_cell"], tex.noise_basis,
+             tex.noise_distortion, tex.distortion, tex.noise_scale, tex.nabla, ramp]
+    return hashlib.blake2b(json.dumps(state).encode(), digest_size=8).hexdigest()
+
+def color_noise_stale():
+    tex = bpy.data.textures.get("FX_ColorNoise")
+    image = bpy.data.images.get(COLOR_NOISE_IMAGE)
+    inputs = color_noise_inputs(tex) if tex else None
+    if not inputs or not inputs[0]:
+        return False  # nothing uses the group yet
+    return not (image and image.get("aperturia_key") == color_noise_key(color_noise_layout(*inputs)))
+
+def create_color_noise_scene(tex):
+    if COLOR_NOISE_SCENE in bpy.data.scenes:
+        bpy.data.scenes.remove(bpy.data.scenes[COLOR_NOISE_SCENE])
+    scene = bpy.data.scenes.new(COLOR_NOISE_SCENE)
+    scene.render.resolution_percentage = 100
+    scene.render.use_compositing = True
+    scene.render.use_sequencer = False
+    scene.use_nodes = True
+
+    tree = scene.node_tree
+    tree.nodes.clear()
+    texture = tree.nodes.new("CompositorNodeTexture")
+    texture.texture = tex
+    composite = tree.nodes.new("CompositorNodeComposite")
+    viewer = tree.nodes.new("CompositorNodeViewer")
+    tree.links.new(texture.outputs[1], composite.inputs[0])
+    tree.links.new(texture.outputs[1], viewer.inputs[0])
+    return scene, texture
+
+def render_color_noise_tile(scene, texture, origin, spacing, samples):
+    # The Texture node maps texel centres to [-1, 1] * Scale + Offset, so this
+    # places them at origin + (i + 0.5) * spacing in texture units
+    half = [spacing[a] * samples[a] / 2.0 for a in (0, 1)]
+    texture.inputs["Scale"].default_value = (half[0], half[1], 1.0)
+    texture.inputs["Offset"].default_value = (origin[0] + half[0], origin[1] + half[1], 0.0)
+    scene.render.resolution_x, scene.render.resolution_y = samples
+    bpy.ops.render.render(scene=scene.name)
+
+    img = bpy.data.images.get("Viewer Node")
+    if img is None or tuple(img.size) != tuple(samples):
+        raise RuntimeError("The color noise texture did not reach the Viewer node.")
+    pixels = np.empty((samples[1], samples[0], 4), dtype=np.float32)
+    img.pixels.foreach_get(pixels.reshape(-1))
+    return pixels
+
+def bake_color_noise(force=False):
+    tex = bpy.data.textures.get("FX_ColorNoise")
+    image = bpy.data.images.get(COLOR_NOISE_IMAGE)
+    if tex is None:
+        return image
+    inputs = color_noise_inputs(tex)
+    if not inputs[0] and not force:
+        return image  # nothing uses the group yet
+    layout = color_noise_layout(*inputs)
+    key = color_noise_key(layout)
+    if image and image.get("aperturia_key") == key and not force:
+        return image
+
+    with metrics.phase("bake_color_noise"):
+        outer = layout["field"]
+        (grid_w, grid_h), (per_x, per_y) = layout["cells"], layout["per_cell"]
+        cell = (2.0 * outer / grid_w, 2.0 * outer / grid_h)
+        spacing = (cell[0] / per_x, cell[1] / per_y)
+        tile_w, tile_h = max(1, COLOR_NOISE_TILE // per_x), max(1, COLOR_NOISE_TILE // per_y)
+
+        pixels = np.ones((grid_h, grid_w, 4), dtype=np.float32)
+        scene, texture = create_color_noise_scene(tex)
+        try:
+            for y0 in range(0, grid_h, tile_h):
+                rows = min(tile_h, grid_h - y0)
+                for x0 in range(0, grid_w, tile_w):
+                    cols = min(tile_w, grid_w - x0)
+                    origin = (-outer + x0 * cell[0], -outer + y0 * cell[1])
+                    samples = render_color_noise_tile(scene, texture, origin, spacing, (cols * per_x, rows * per_y))
+                    # Area average of each cell
+                    cells = samples.reshape(rows, per_y, cols, per_x, 4).mean(axis=(1, 3))
+                    pixels[y0:y0 + rows, x0:x0 + cols, :3] = cells[..., :3]
+        finally:
+            bpy.data.scenes.remove(scene)
+
+        if image is None:
+            image = bpy.data.images.new(COLOR_NOISE_IMAGE, grid_w, grid_h, float_buffer=True)
+        elif tuple(image.size) != (grid_w, grid_h):
+            image.scale(grid_w, grid_h)
+        image.pixels.foreach_set(pixels.reshape(-1))
+        image.pack()
+        image["aperturia_key"] = key
+        image["aperturia_field"] = outer
+        sync_color_noise_field()
+        metrics.count("color_noise_samples", grid_w * per_x * grid_h * per_y)
+    return image
+
+def sync_color_noise_field(group=None):
+    # ColorNoiseZoom divides the baked field size by each instance's scale
+    group = group or bpy.data.node_groups.get("Aperturia FX")
+    image = bpy.data.images.get(COLOR_NOISE_IMAGE)
+    node = group.nodes.get("ColorNoiseField") if group else None
+    if node and image:
+        node.outputs[0].default_value = image.get("aperturia_field", 100.0)
+
+def deferred_color_noise_bake():
+    # The bake renders a scratch scene, which has to wait for a running render
+    if bpy.app.is_job_running('RENDER'):
+        return 0.5
+    try:
+        bake_color_noise()
+    except Exception as e:
+        print(f"Aperturia color noise bake failed: {e}")
+    return None
+
+color_noise_sizes = {}
+
+def color_noise_touched(scene, depsgraph):
+    # Only node trees, their keyframes, FX_ColorNoise and the render size feed
+    # the layout, so other updates skip the walk over every scene
+    for update in depsgraph.updates:
+        data = update.id.original
+        if isinstance(data, (bpy.types.NodeTree, bpy.types.Action)):
+            return True
+        if isinstance(data, bpy.types.Texture) and data.name == "FX_ColorNoise":
+            return True
+    size = render_size(scene)
+    if color_noise_sizes.get(scene.as_pointer()) != size:
+        color_noise_sizes[scene.as_pointer()] = size
+        return True
+    return False
+
+@persistent
+def on_depsgraph_update(scene, depsgraph=None):
+    # Slider drags fire many updates; bake once they settle. Playback only
+    # moves animated values between keys the layout already covers
+    if scene.name == COLOR_NOISE_SCENE:
+        return
+    screen = bpy.context.screen
+    if screen and screen.is_animation_playing:
+        return
+    if depsgraph is not None and not color_noise_touched(scene, depsgraph):
+        return
+    if find_aperturia_node(scene) is None or not color_noise_stale():
+        return
+    if not bpy.app.timers.is_registered(deferred_color_noise_bake):
+        bpy.app.timers.register(deferred_color_noise_bake, first_interval=0.5)
+
+# === BENCHMARK SCENE ===
+# Renders the group on its own: a compositor tree without a Render Layers node
+# makes Blender skip the scene render, so the timing is compositor work only.
+
+BENCH_SCENE = "AperturiaFX_Bench"
+
+def get_sample_image(scene, resolution):
+    settings = scene.aperturia
+    if settings.sample_image:
+        return settings.sample_image
+    name = "AperturiaFX_Sample"
+    img = bpy.data.images.get(name)
+    if img and tuple(img.size) != tuple(resolution):
+        bpy.data.images.remove(img)
+        img = None
+    if img is None:
+        img = bpy.data.images.new(name, resolution[0], resolution[1], float_buffer=True)
+        img.generated_type = 'COLOR_GRID'
+    return img
+
+def create_bench_scene(image, resolution, source_node=None):
+    if BENCH_SCENE in bpy.data.scenes:
+        bpy.data.scenes.remove(bpy.data.scenes[BENCH_SCENE])
+    bench = bpy.data.scenes.new(BENCH_SCENE)
+    bench.render.resolution_x, bench.render.resolution_y = resolution
+    bench.render.resolution_percentage = 100
+    bench.render.use_compositing = True
+    bench.render.use_sequencer = False
+    bench.use_nodes = True
+
+    tree = bench.node_tree
+    tree.nodes.clear()
+    src = tree.nodes.new("CompositorNodeImage")
+    src.image = image
+    fx = tree.nodes.new("CompositorNodeGroup")
+    fx.node_tree = bpy.data.node_groups["Aperturia FX"]
+    composite = tree.nodes.new("CompositorNodeComposite")
+    viewer = tree.nodes.new("CompositorNodeViewer")
+    tree.links.new(src.outputs[0], fx.inputs["Image"])
+    tree.links.new(fx.outputs[0], composite.inputs[0])
+    tree.links.new(fx.outputs[0], viewer.inputs[0])
+
+    # Benchmark with the artist's slider values, not the group defaults
+    if source_node:
+        for sock in source_node.inputs:
+            if sock.name != "Image" and sock.name in fx.inputs:
+                fx.inputs[sock.name].default_value = sock.default_value
+    return bench, fx
+
+def remove_bench_scene():
+    if BENCH_SCENE in bpy.data.scenes:
+        bpy.data.scenes.remove(bpy.data.scenes[BENCH_SCENE])
+
+def render_group_pixels(bench, fx, params, frame, out=None):
+    # One compositor-only run of the group; the Viewer holds its linear output.
+    # A bench can hold several group nodes, the outputs follow the one rendered
+    tree = bench.node_tree
+    for node in tree.nodes:
+        if node.bl_idname in ("CompositorNodeComposite", "CompositorNodeViewer"):
+            if not any(link.from_node == fx for link in node.inputs[0].links):
+                tree.links.new(fx.outputs[0], node.inputs[0])
+    for name, value in params.items():
+        if name in fx.inputs:
+            fx.inputs[name].default_value = value
+    bench.frame_current = frame  # the Map Value drivers read the frame
+    bpy.ops.render.render(scene=bench.name)
+
+    img = bpy.data.images.get("Viewer Node")
+    if img is None:
+        raise RuntimeError("The group did not reach the Viewer node.")
+    width, height = img.size
+    if out is None or out.shape != (height, width, 4):
+        out = np.empty((height, width, 4), dtype=np.float32)
+    img.pixels.foreach_get(out.reshape(-1))
+    return out
+
+def time_group_render(bench, repeats=3):
+    bpy.ops.render.render(scene=bench.name)  # warm-up, fills caches
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        bpy.ops.render.render(scene=bench.name)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+# === QUALITY SETTINGS ===
+# Ordered from best looking to fastest. Every level is relative to the values
+# the group was built with, so "Full" always means the original look.
+
+quality_levels = [
+    {"name": "Full", "glare_quality": 'HIGH', "denoise": True, "denoise_hdr": True, "blur_factor": 1.0, "jitter": True},
+    {"name": "High", "glare_quality": 'MEDIUM', "denoise": True, "denoise_hdr": True, "blur_factor": 1.0, "jitter": True},
+    {"name": "Balanced", "glare_quality": 'MEDIUM', "denoise": True, "denoise_hdr": False, "blur_factor": 0.5, "jitter": True},
+    {"name": "Fast", "glare_quality": 'LOW', "denoise": True, "denoise_hdr": False, "blur_factor": 0.5, "jitter": False},
+    {"name": "Draft", "glare_quality": 'LOW', "denoise": False, "denoise_hdr": False, "blur_factor": 0.25, "jitter": False},
+]
+
+glare_rank = {'LOW': 0, 'MEDIUM': 1, 'HIGH': 2}
+
+def node_baseline(node, attr):
+    # Remember the as-built value on the node itself so levels never compound
+    key = "aperturia_base_" + attr
+    if key not in node:
+        node[key] = getattr(node, attr)
+    return node[key]
+
+def apply_quality_settings(settings, group=None):
+    group = group or bpy.data.node_groups.get("Aperturia FX")
+    if group is None:
+        return False
+
+    for node in group.nodes:
+        if node.bl_idname == "CompositorNodeGlare":
+            node.quality = min(node_baseline(node, "quality"), settings["glare_quality"], key=glare_rank.get)
+        elif node.bl_idname == "CompositorNodeDenoise":
+            node.mute = not settings["denoise"]
+            node.use_hdr = bool(node_baseline(node, "use_hdr")) and settings["denoise_hdr"]
+        elif node.bl_idname == "CompositorNodeBlur":
+            node.size_x = max(1, round(node_baseline(node, "size_x") * settings["blur_factor"]))
+            node.size_y = max(1, round(node_baseline(node, "size_y") * settings["blur_factor"]))
+        elif node.bl_idname == "CompositorNodeLensdist":
+            node.use_jitter = bool(node_baseline(node, "use_jitter")) and settings["jitter"]
+    return True
+
+quality_attrs = {
+    "CompositorNodeGlare": ("quality",),
+    "CompositorNodeDenoise": ("mute", "use_hdr"),
+    "CompositorNodeBlur": ("size_x", "size_y"),
+    "CompositorNodeLensdist": ("use_jitter",),
+}
+
+def snapshot_quality_state(group=None):
+    # Exact per-node values, so benchmarks can put back whatever was applied
+    group = group or bpy.data.node_groups.get("Aperturia FX")
+    if group is None:
+        return {}
+    return {node.name: {attr: getattr(node, attr) for attr in quality_attrs[node.bl_idname]}
+            for node in group.nodes if node.bl_idname in quality_attrs}
+
+def restore_quality_state(state, group=None):
+    group = group or bpy.data.node_groups.get("Aperturia FX")
+    if group is None:
+        return
+    for name, values in state.items():
+        node = group.nodes.get(name)
+        if node:
+            for attr, value in values.items():
+                setattr(node, attr, value)
+
+def store_quality_settings(scene, settings):
+    # The group is rebuilt on every add-on start, which resets its nodes, so
+    # the chosen level is kept on the scene and reapplied after each build
+    scene.aperturia.quality_settings = json.dumps(settings)
+
+def stored_quality_settings():
+    try:
+        scenes = [bpy.context.scene] + list(bpy.data.scenes)
+    except AttributeError:
+        return None  # restricted context during registration
+    for scene in scenes:
+        data = getattr(getattr(scene, "aperturia", None), "quality_settings", "")
+        if data:
+            try:
+                return json.loads(data)
+            except ValueError:
+                print(f"Ignoring unreadable Aperturia quality settings on scene '{scene.name}'")
+    return None
+
+# === PRESET FILES ===
+
+def get_preset_dir():
+    return bpy.utils.user_resource('SCRIPTS', path=os.path.join("presets", "aperturia_fx"), create=True)
+
+def save_quality_preset(name, settings, extra=None):
+    data = {"name": name, "settings": settings}
+    data.update(extra or {})
+    path = os.path.join(get_preset_dir(), bpy.path.clean_name(name) + ".json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    return path
+
+def load_quality_preset(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def list_quality_presets():
+    presets = {}
+    preset_dir = get_preset_dir()
+    if preset_dir and os.path.isdir(preset_dir):
+        for filename in sorted(os.listdir(preset_dir)):
+            if filename.endswith(".json"):
+                presets[os.path.splitext(filename)[0]] = os.path.join(preset_dir, filename)
+    return presets
+
+# === AUTO-TUNER ===
+
+def auto_tune(scene, target_ms, repeats=3, report=None):
+    resolution = render_size(scene)
+    image = get_sample_image(scene, resolution)
+    bench, _ = create_bench_scene(image, resolution, find_aperturia_node(scene))
+
+    results = []
+    chosen = None
+    applied = snapshot_quality_state()
+    try:
+        for level in quality_levels:
+            apply_quality_settings(level)
+            ms = time_group_render(bench, repeats) * 1000.0
+            results.append((level, ms))
+            if report:
+                report(f"{level['name']}: {ms:.1f} ms")
+            if ms <= target_ms:
+                chosen = (level, ms)
+                break
+    except Exception:
+        # A failed benchmark must not leave the group at a trial level
+        restore_quality_state(applied)
+        raise
+    finally:
+        remove_bench_scene()
+
+    # Nothing fits the budget: fall back to the fastest level we measured
+    if chosen is None:
+        chosen = results[-1]
+    apply_quality_settings(chosen[0])
+    store_quality_settings(scene, chosen[0])
+    return chosen, results
+
+# === REGRESSION HARNESS ===
+# Golden frames are always recorded at "Full" quality. Comparing then renders
+# every quality level against them, so a graph change and a faster level are
+# judged the same way: PSNR/SSIM next to render time.
+
+regression_eras = (0.0, 0.25, 0.5, 0.75, 1.0)
+
+regression_param_sets = {
+    "Defaults": {},
+    "Heavy": {
+        "General Noise": 0.5,
+        "Color Noise intensity": 0.5,
+        "Lens Distortion": 0.05,
+        "Lens Dispersion": 0.005,
+        "Vignette Amount": 1.0,
+        "Image Scale": 50.0,
+    },
+}
+
+image_extensions = {".png", ".jpg", ".jpeg", ".exr", ".tif", ".tiff", ".hdr"}
+
+def read_viewer_pixels():
+    img = bpy.data.images.get("Viewer Node")
+    if img is None:
+        return None
+    w, h = img.size
+    buf = np.empty(w * h * 4, dtype=np.float32)
+    img.pixels.foreach_get(buf)
+    return buf.reshape(h, w, 4)
+
+def psnr(a, b):
+    a = np.clip(a[..., :3], 0.0, 1.0)
+    b = np.clip(b[..., :3], 0.0, 1.0)
+    mse = float(np.mean((a - b) ** 2))
+    if mse == 0.0:
+        return float("inf")
+    return 10.0 * np.log10(1.0 / mse)
+
+def box_filter(a, radius):
+    # Mean over a (2r+1)^2 window using an integral image, edges clamped
+    size = 2 * radius + 1
+    padded = np.pad(a, radius + 1, mode="edge")
+    integral = padded.cumsum(0).cumsum(1)
+    total = (integral[size:, size:] - integral[:-size, size:]
+             - integral[size:, :-size] + integral[:-size, :-size])
+    return total[:a.shape[0], :a.shape[1]] / (size * size)
+
+def ssim(a, b, radius=3):
+    weights = np.array([0.2126, 0.7152, 0.0722], dtype=np.float64)
+    x = np.clip(a[..., :3], 0.0, 1.0) @ weights
+    y = np.clip(b[..., :3], 0.0, 1.0) @ weights
+    c1, c2 = 0.01 ** 2, 0.03 ** 2
+
+    mu_x, mu_y = box_filter(x, radius), box_filter(y, radius)
+    var_x = box_filter(x * x, radius) - mu_x * mu_x
+    var_y = box_filter(y * y, radius) - mu_y * mu_y
+    cov = box_filter(x * y, radius) - mu_x * mu_y
+
+    num = (2 * mu_x * mu_y + c1) * (2 * cov + c2)
+    den = (mu_x * mu_x + mu_y * mu_y + c1) * (var_x + var_y + c2)
+    return float(np.mean(num / den))
+
+def load_reference_inputs(reference_dir):
+    images = []
+    if reference_dir and os.path.isdir(bpy.path.abspath(reference_dir)):
+        folder = bpy.path.abspath(reference_dir)
+        for filename in sorted(os.listdir(folder)):
+            if os.path.splitext(filename)[1].lower() in image_extensions:
+                try:
+                    images.append(bpy.data.images.load(os.path.join(folder, filename), check_existing=True))
+                except Exception as e:
+                    print(f"Failed to load reference image: {filename}\n{e}")
+    return images
+
+def regression_cases(images):
+    for image in images:
+        stem = bpy.path.clean_name(os.path.splitext(image.name)[0])
+        for era in regression_eras:
+            for set_name, params in regression_param_sets.items():
+                yield f"{stem}__era{era:.2f}__{set_name}", image, era, params
+
+def render_case(image, era, params, repeats):
+    bench, fx = create_bench_scene(image, tuple(image.size))
+    fx.inputs["Camera Era"].default_value = era
+    for name, value in params.items():
+        fx.inputs[name].default_value = value
+    seconds = time_group_render(bench, repeats)
+    return read_viewer_pixels().copy(), seconds * 1000.0
+
+def run_regression(scene, mode, report=None):
+    settings = scene.aperturia
+    out_dir = bpy.path.abspath(settings.regression_dir)
+    golden_dir = os.path.join(out_dir, "golden")
+    os.makedirs(golden_dir, exist_ok=True)
+    manifest_path = os.path.join(golden_dir, "manifest.json")
+
+    images = load_reference_inputs(settings.reference_dir)
+    if not images:
+        images = [get_sample_image(scene, render_size(scene))]
+
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+
+    levels = quality_levels[:1] if mode == 'RECORD' else quality_levels
+    rows = []
+    applied = snapshot_quality_state()
+    try:
+        for level in levels:
+            apply_quality_settings(level)
+            for key, image, era, params in regression_cases(images):
+                pixels, ms = render_case(image, era, params, settings.bench_repeats)
+                if mode == 'RECORD':
+                    np.save(os.path.join(golden_dir, key + ".npy"), pixels)
+                    manifest[key] = {"ms": ms, "shape": list(pixels.shape)}
+                    rows.append({"case": key, "level": level["name"], "ms": ms})
+                    continue
+
+                golden_path = os.path.join(golden_dir, key + ".npy")
+                if not os.path.exists(golden_path):
+                    rows.append({"case": key, "level": level["name"], "ms": ms, "error": "no golden"})
+                    continue
+                golden = np.load(golden_path)
+                row = {"case": key, "level": level["name"], "ms": ms}
+                if golden.shape != pixels.shape:
+                    row["error"] = f"shape {list(pixels.shape)} != golden {list(golden.shape)}"
+                else:
+                    row["golden_ms"] = manifest.get(key, {}).get("ms")
+                    row["psnr"] = psnr(golden, pixels)
+                    row["ssim"] = ssim(golden, pixels)
+                rows.append(row)
+                if report:
+                    report(f"{key} [{level['name']}]: {ms:.1f} ms, PSNR {row.get('psnr', 0.0):.2f} dB, SSIM {row.get('ssim', 0.0):.4f}")
+    finally:
+        remove_bench_scene()
+        restore_quality_state(applied)
+
+    if mode == 'RECORD':
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+
+    report_path = os.path.join(out_dir, "report.json")
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump({"mode": mode, "rows": rows}, f, indent=2)
+    return rows, report_path
+
+# === POST-RENDER MODE ===
+# Applies the look to written frames without touching the scene's node tree.
+# The group itself runs on every frame in a compositor-only bench scene, so the
+# result is the same as wiring it into the compositor. Blender does not expose
+# Render Result pixels to Python and a render cannot be started from another
+# render's handlers, so the work is split in two:
+#   render_write   saves the frame's scene-linear Render Result to a temporary
+#                  EXR and queues it (this runs on the render thread)
+#   main thread    a timer takes each queued frame while the job carries on
+#                  with the next one, runs it through the group and writes it
+#                  over the saved frame with the scene's own file format and
+#                  color management, then deletes the temporary EXR
+# So at most a frame or two of scratch EXRs exist at once. Background renders
+# run no timers and drain the queue when the job ends. Movie and multilayer EXR
+# outputs are skipped: a single frame cannot be rewritten in place there.
+# Pixels move through float32 buffers that are reused while the resolution
+# stays the same.
+
+def post_hook_warning(scene):
+    render = scene.render
+    if render.is_movie_format:
+        return "Apply After Render needs an image sequence, movie output is skipped"
+    if render.image_settings.file_format == 'OPEN_EXR_MULTILAYER':
+        return "Apply After Render would flatten multilayer EXR passes, output is skipped"
+    return None
+
+def group_parameters(scene, node=None):
+    node = node or find_aperturia_node(scene)
+    if node:
+        return {sock.name: sock.default_value for sock in node.inputs if sock.name != "Image"}
+    params = {}
+    group = bpy.data.node_groups.get("Aperturia FX")
+    if group:
+        for item in group.interface.items_tree:
+            if item.item_type == 'SOCKET' and item.in_out == 'INPUT' and item.name != "Image":
+                params[item.name] = item.default_value
+    return params
+
+@contextmanager
+def image_format(scene, file_format, **values):
+    # Switches the scene's output format around a save_render call
+    fmt = scene.render.image_settings
+    saved = [("file_format", fmt.file_format)] + [(name, getattr(fmt, name)) for name in values]
+    try:
+        fmt.file_format = file_format
+        for name, value in values.items():
+            setattr(fmt, name, value)
+        yield fmt
+    finally:
+        for name, value in saved:
+            setattr(fmt, name, value)
+
+def group_state():
+    # Group settings the output depends on besides its inputs
+    image = bpy.data.images.get(COLOR_NOISE_IMAGE)
+    return [snapshot_quality_state(), image.get("aperturia_key") if image else None]
+
+# === FRAME CACHE ===
+# The only time-varying part of the group is the compression noise: the Map
+# Value drivers offset FX_CompressionNoise, and each branch lays it over its
+# image with "Alpha Over - DSLR/Camcorder/Retro" at "Compression Noise
+# intensity" c. Everything after those nodes is linear (resampling, preset
+# weights, alpha stacking, added overlays), so for one frame
+#     output = (1 - c) * S + O + c * N(frame)
+# where S is the image side, O the fingerprint/smudge overlays and N the noise.
+# The cache holds the group output at c = 0 (S + O), keyed by a hash of the
+# input pixels, the other group inputs and the quality settings but not the
+# frame, so held frames and static turntables hit. A copy of the group with the
+# image side of those Alpha Over nodes cut renders O + c * N(frame) each frame;
+# none of the heavy nodes feed it, so it costs the noise textures and the
+# stacking only. O itself is that copy at c = 0 and is kept until the inputs
+# change. The Retro branch clamps after its noise, so very bright pixels can
+# differ by at most c (0.002 by default) from a full run.
+# Evicted arrays are reused for new entries, so a warm cache does not allocate.
+class FrameCache:
+    def __init__(self, max_entries=8, disk_dir="", max_disk_entries=64):
+        self.entries = OrderedDict()
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.max_disk_entries = max_disk_entries
+        self.hits = 0
+        self.misses = 0
+
+    def configure(self, max_entries, disk_dir, max_disk_entries):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.max_disk_entries = max_disk_entries
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+    def disk_path(self, key):
+        return os.path.join(self.disk_dir, key + ".npy")
+
+    def get_into(self, key, out):
+        data = self.entries.get(key)
+        if data is not None:
+            self.entries.move_to_end(key)
+        elif self.disk_dir and os.path.exists(self.disk_path(key)):
+            data = np.load(self.disk_path(key), mmap_mode='r')
+        if data is None or data.shape != out.shape:
+            self.misses += 1
+            return False
+        np.copyto(out, data)
+        self.hits += 1
+        return True
+
+    def put(self, key, data):
+        spare = None
+        if len(self.entries) >= self.max_entries:
+            _, spare = self.entries.popitem(last=False)
+        if spare is None or spare.shape != data.shape:
+            spare = np.empty_like(data)
+        np.copyto(spare, data)
+        self.entries[key] = spare
+
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            np.save(self.disk_path(key), data)
+            self.trim_disk()
+
+    def trim_disk(self):
+        files = [os.path.join(self.disk_dir, name) for name in os.listdir(self.disk_dir) if name.endswith(".npy")]
+        if len(files) <= self.max_disk_entries:
+            return
+        files.sort(key=os.path.getmtime)
+        for path in files[:len(files) - self.max_disk_entries]:
+            os.remove(path)
+
+def frame_cache_key(pixels, params, state):
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(memoryview(pixels).cast("B"))
+    digest.update(json.dumps([pixels.shape, params, state], sort_keys=True).encode())
+    return digest.hexdigest()
+
+NOISE_INPUT = "Compression Noise intensity"
+NOISE_GROUP = "AperturiaFX_NoiseLayer"
+noise_layers = ("Alpha Over - DSLR", "Alpha Over - Camcorder", "Alpha Over - Retro")
+
+def build_noise_group(group):
+    # The group with the image side of each compression-noise Alpha Over cut
+    if NOISE_GROUP in bpy.data.node_groups:
+        bpy.data.node_groups.remove(bpy.data.node_groups[NOISE_GROUP])
+    noise = group.copy()
+    noise.name = NOISE_GROUP
+    noise.use_fake_user = False
+    for name in noise_layers:
+        node = noise.nodes[name]
+        for link in list(node.inputs[1].links):
+            noise.links.remove(link)
+        node.inputs[1].default_value = (0.0, 0.0, 0.0, 1.0)
+    return noise
+
+POST_SOURCE = "AperturiaFX_PostSource"
+POST_LINEAR = "AperturiaFX_PostLinear"
+POST_RESULT = "AperturiaFX_PostFrame"
+
+class PostProcessor:
+    def __init__(self):
+        self.width = 0
+        self.height = 0
+        self.buf = None
+        self.staging = None
+        self.source = None
+        self.bench = None
+        self.fx = None
+        self.noise_fx = None
+        self.noise = None
+        self.overlays = None
+        self.overlays_key = None
+        self.frame_cache = None
+
+    def ensure_buffers(self, width, height):
+        if (width, height) == (self.width, self.height):
+            return
+        self.buf = np.empty((height, width, 4), dtype=np.float32)
+        self.staging = np.empty((height, width, 4), dtype=np.float32)
+        self.noise = np.empty((height, width, 4), dtype=np.float32)
+        self.overlays = np.empty((height, width, 4), dtype=np.float32)
+        self.overlays_key = None
+        self.width, self.height = width, height
+
+    def configure_frame_cache(self, settings):
+        if not settings.use_frame_cache:
+            self.frame_cache = None
+            return
+        if self.frame_cache is None:
+            self.frame_cache = FrameCache()
+        self.frame_cache.configure(settings.frame_cache_size,
+                                   bpy.path.abspath(settings.frame_cache_dir) if settings.frame_cache_dir else "",
+                                   settings.frame_cache_disk_size)
+
+    def begin(self, scene, width, height):
+        self.ensure_buffers(width, height)
+        source = bpy.data.images.get(POST_SOURCE)
+        if source and tuple(source.size) != (width, height):
+            bpy.data.images.remove(source)
+            source = None
+        if source is None:
+            source = bpy.data.images.new(POST_SOURCE, width, height, alpha=True, float_buffer=True)
+        self.source = source
+        self.bench, self.fx = create_bench_scene(source, (width, height), find_aperturia_node(scene))
+        self.noise_fx = self.bench.node_tree.nodes.new("CompositorNodeGroup")
+        self.noise_fx.node_tree = build_noise_group(self.fx.node_tree)
+        self.overlays_key = None
+
+    def end(self):
+        if self.bench is not None:
+            remove_bench_scene()
+        if NOISE_GROUP in bpy.data.node_groups:
+            bpy.data.node_groups.remove(bpy.data.node_groups[NOISE_GROUP])
+        self.bench = self.fx = self.noise_fx = None
+        self.overlays_key = None
+
+    def noise_group(self):
+        return self.noise_fx.node_tree if self.noise_fx else None
+
+    def render(self, node, params, frame, out):
+        if render_group_pixels(self.bench, node, params, frame, out) is not out:
+            raise RuntimeError(f"Group output does not match {self.width}x{self.height}")
+
+    def run(self, params, frame, region=None):
+        # Group output replaces self.buf; region is the crop the layout is set for
+        if not self.frame_cache:
+            self.source.pixels.foreach_set(self.buf.reshape(-1))
+            self.source.update()
+            self.render(self.fx, params, frame, self.buf)
+            return
+
+        intensity = params.get(NOISE_INPUT, 0.0)
+        still = dict(params)
+        still[NOISE_INPUT] = 0.0
+        state = [group_state(), region]
+        key = frame_cache_key(self.buf, still, state)
+        if not self.frame_cache.get_into(key, self.buf):
+            self.source.pixels.foreach_set(self.buf.reshape(-1))
+            self.source.update()
+            self.render(self.fx, still, frame, self.buf)
+            self.frame_cache.put(key, self.buf)
+        if intensity:
+            self.add_noise(still, intensity, frame, state)
+
+    def add_noise(self, still, intensity, frame, state):
+        # self.buf holds S + O; turn it into (1 - c) * S + O + c * N(frame)
+        overlays_key = json.dumps([still, state], sort_keys=True)
+        if overlays_key != self.overlays_key:
+            self.render(self.noise_fx, still, frame, self.overlays)
+            self.overlays_key = overlays_key
+        noisy = dict(still)
+        noisy[NOISE_INPUT] = intensity
+        self.render(self.noise_fx, noisy, frame, self.noise)
+        rgb = self.buf[..., :3]
+        rgb -= self.overlays[..., :3]
+        rgb *= 1.0 - intensity
+        rgb += self.noise[..., :3]
+
+post_processor = PostProcessor()
+post_queue = queue.Queue()  # filled on the render thread, drained on the main thread
+# Bench renders fire the render handlers too; "draining" keeps them from
+# re-entering the queue and "streaming" leaves stream_render's frames alone
+post_state = {"draining": False, "streaming": False}
+
+def load_post_frame(path):
+    img = bpy.data.images.get(POST_LINEAR)
+    if img is None:
+        img = bpy.data.images.load(path)
+        img.name = POST_LINEAR
+    else:
+        img.filepath = path
+        img.reload()
+    return img
+
+def process_post_frame(scene, job):
+    linear = load_post_frame(job["linear"])
+    width, height = linear.size
+    proc = post_processor
+    if proc.bench is None or (width, height) != (proc.width, proc.height):
+        proc.end()
+        proc.begin(scene, width, height)
+    proc.configure_frame_cache(scene.aperturia)
+    linear.pixels.foreach_get(proc.buf.reshape(-1))
+
+    region = job["region"]
+    border = region is not None and (width, height) == region["size"]
+    cropped = region is not None and not border
+    if border:
+        np.copyto(proc.staging, proc.buf)
+    groups = [group for group in (bpy.data.node_groups.get("Aperturia FX"), proc.noise_group()) if group]
+    if cropped:
+        for group in groups:
+            set_render_region(region, group)
+    try:
+        proc.run(job["params"], job["frame"], region if cropped else None)
+    finally:
+        if cropped:
+            for group in groups:
+                set_render_region(None, group)
+    out = proc.buf
+    if border:
+        # Border without crop: outside the region the frame stays as rendered
+        x0, y0, x1, y1 = region["rect"]
+        proc.staging[y0:y1, x0:x1] = proc.buf[y0:y1, x0:x1]
+        out = proc.staging
+
+    result = bpy.data.images.get(POST_RESULT)
+    if result and tuple(result.size) != (width, height):
+        bpy.data.images.remove(result)
+        result = None
+    if result is None:
+        result = bpy.data.images.new(POST_RESULT, width, height, alpha=True, float_buffer=True)
+    result.pixels.foreach_set(out.reshape(-1))
+    result.save_render(job["path"], scene=scene)
+
+def process_post_queue(limit=None):
+    # Never re-enter or take over the processor stream_render is using
+    if post_state["draining"] or post_state["streaming"]:
+        return
+    post_state["draining"] = True
+    done = 0
+    try:
+        while not post_queue.empty() and (limit is None or done < limit):
+            done += 1
+            job = post_queue.get()
+            scene = bpy.data.scenes.get(job["scene"])
+            try:
+                if scene:
+                    process_post_frame(scene, job)
+            except Exception as e:
+                print(f"Aperturia post-render pass failed: {job['path']}\n{e}")
+            finally:
+                if os.path.exists(job["linear"]):
+                    os.remove(job["linear"])
+    finally:
+        # A timer keeps the bench between frames of a running job
+        if limit is None:
+            post_processor.end()
+        post_state["draining"] = False
+
+def post_queue_timer():
+    # One frame per tick keeps the interface responsive during the render
+    if not post_queue.empty():
+        process_post_queue(limit=1)
+        return 0.05
+    if post_processor.bench is not None and not post_state["streaming"] and not bpy.app.is_job_running('RENDER'):
+        post_processor.end()
+    return 0.5
+
+@persistent
+def on_render_write(scene, *args):
+    # stream_render applies the group to its own frames
+    if not scene.aperturia.use_post_hook or post_state["streaming"]:
+        return
+
+    node = find_aperturia_node(scene)
+    if group_is_wired(scene, node):
+        print("Aperturia FX is wired into the compositor, skipping post-render pass.")
+        return
+    warning = post_hook_warning(scene)
+    if warning:
+        print(f"Aperturia FX: {warning}.")
+        return
+
+    frame = scene.frame_current
+    path = scene.render.frame_path(frame=frame)
+    if not os.path.exists(path):
+        return
+    linear = os.path.join(bpy.app.tempdir, f"aperturia_post_{frame}.exr")
+    try:
+        with image_format(scene, 'OPEN_EXR', color_mode='RGBA', color_depth='32'):
+            bpy.data.images["Render Result"].save_render(linear, scene=scene)
+    except Exception as e:
+        print(f"Aperturia post-render capture failed: {path}\n{e}")
+        return
+    post_queue.put({
+        "scene": scene.name,
+        "frame": frame,
+        "path": path,
+        "linear": linear,
+        "params": animated_inputs(scene, node, frame) if node else group_parameters(scene),
+        "region": render_region(scene),
+    })
+
+@persistent
+def on_render_done(scene, *args):
+    # Background renders exit without running timers
+    if scene.name in (BENCH_SCENE, COLOR_NOISE_SCENE):
+        return
+    if bpy.app.background:
+        process_post_queue()
+
+@persistent
+def on_render_post(scene, *args):
+    # Leaves the viewport compositor with the full-frame layout. Bench renders
+    # are skipped: process_post_frame sets the layout around them itself
+    if scene.name in (BENCH_SCENE, COLOR_NOISE_SCENE):
+        return
+    try:
+        set_render_region(None)
+    except Exception as e:
+        print(f"Aperturia render region restore failed: {e}")
+
+@persistent
+def on_render_pre(scene, *args):
+    if scene.name in (BENCH_SCENE, COLOR_NOISE_SCENE):
+        return
+    try:
+        sync_render_region(scene)
+        # Baking renders a scratch scene, so it never runs from a render
+        # handler; the debounced timer or the next file load catches up
+        if color_noise_stale():
+            print("Aperturia FX: color noise is out of date for this render, it is re-baked afterwards")
+    except Exception as e:
+        print(f"Aperturia render setup failed: {e}")
+
+# === STREAMING OUTPUT ===
+# Composited frames are read from a temporary Viewer node and piped to an
+# encoder as raw RGBA64. A fixed pool of frame buffers bounds memory: when the
+# encoder falls behind, the render loop blocks waiting for a free buffer.
+# Viewer pixels are scene linear, so each frame goes through the scene's view
+# transform, look and exposure (see display_encode) before it is queued.
+
+class FrameStream:
+    def __init__(self, cmd, width, height, queue_size, log_path):
+        self.width = width
+        self.height = height
+        self.error = None
+        self.free = queue.Queue()
+        self.pending = queue.Queue(maxsize=queue_size)
+        for _ in range(queue_size + 1):
+            self.free.put(np.empty((height * width, 4), dtype=np.uint16))
+        self.log = open(log_path, "wb")
+        try:
+            self.proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=self.log)
+        except OSError:
+            self.log.close()
+            raise
+        self.writer = threading.Thread(target=self.write_loop, daemon=True)
+        self.writer.start()
+
+    def write_loop(self):
+        while True:
+            frame = self.pending.get()
+            if frame is None:
+                break
+            try:
+                if self.error is None:
+                    self.proc.stdin.write(memoryview(frame).cast("B"))
+            except (BrokenPipeError, OSError) as e:
+                self.error = e
+            finally:
+                self.free.put(frame)
+
+    def push(self, pixels):
+        if self.error:
+            raise RuntimeError(f"Encoder stopped: {self.error}")
+        frame = self.free.get()  # blocks while the encoder is behind
+        # Display-encoded float to 16-bit, done in place on the caller's buffer
+        np.clip(pixels, 0.0, 1.0, out=pixels)
+        pixels *= 65535.0
+        np.rint(pixels, out=pixels)
+        np.copyto(frame, pixels, casting='unsafe')
+        self.pending.put(frame)
+
+    def close(self):
+        self.pending.put(None)
+        self.writer.join()
+        try:
+            self.proc.stdin.close()
+        except OSError:
+            pass
+        code = self.proc.wait()
+        self.log.close()
+        if self.error is None and code != 0:
+            self.error = RuntimeError(f"Encoder exited with code {code}")
+        return self.error
+
+def encoder_command(settings, width, height, fps, output):
+    # Blender stores rows bottom-up; a user filter chain runs after the flip
+    args = shlex.split(settings.ffmpeg_args)
+    for i, arg in enumerate(args[:-1]):
+        if arg in ("-vf", "-filter:v"):
+            args[i + 1] = "vflip," + args[i + 1]
+            break
+    else:
+        args = ["-vf", "vflip"] + args
+    return [
+        bpy.path.abspath(settings.ffmpeg_path),
+        "-y", "-loglevel", "error",
+        "-f", "rawvideo", "-pix_fmt", "rgba64le", "-s", f"{width}x{height}", "-r", str(fps),
+        "-i", "-",
+        *args,
+        output,
+    ]
+
+STREAM_IMAGE = "AperturiaFX_StreamFrame"
+STREAM_ENCODED = "AperturiaFX_StreamEncoded"
+
+def display_encode(scene, pixels, width, height, path):
+    # Blender has no Python call for its view transform, so the frame is
+    # written as a 16-bit PNG with the scene's color management, exactly like
+    # a saved frame, and the encoded values are read back into `pixels`
+    img = bpy.data.images.get(STREAM_IMAGE)
+    if img and tuple(img.size) != (width, height):
+        bpy.data.images.remove(img)
+        img = None
+    if img is None:
+        img = bpy.data.images.new(STREAM_IMAGE, width, height, alpha=True, float_buffer=True)
+    img.pixels.foreach_set(pixels.reshape(-1))
+
+    with image_format(scene, 'PNG', color_mode='RGBA', color_depth='16', compression=0):
+        img.save_render(path, scene=scene)
+
+    encoded = bpy.data.images.get(STREAM_ENCODED)
+    if encoded is None:
+        encoded = bpy.data.images.load(path)
+        encoded.name = STREAM_ENCODED
+    else:
+        encoded.filepath = path
+        encoded.reload()
+    encoded.colorspace_settings.name = 'Non-Color'  # keep the display values as written
+    encoded.pixels.foreach_get(pixels.reshape(-1))
+
+@contextmanager
+def viewer_tap(scene, raw=False):
+    # raw=True taps the Render Layers image instead of the final composite.
+    # Only the active Viewer writes "Viewer Node", so the tap is made active
+    # and the artist's active node is given back afterwards
+    tree = scene.node_tree if scene.use_nodes else None
+    source = None
+    if tree is not None and raw:
+        layers = next((n for n in tree.nodes if n.bl_idname == "CompositorNodeRLayers"), None)
+        source = layers.outputs["Image"] if layers else None
+    elif tree is not None:
+        composite = next((n for n in tree.nodes if n.bl_idname == "CompositorNodeComposite"), None)
+        source = composite.inputs[0].links[0].from_socket if composite and composite.inputs[0].is_linked else None
+    if source is None:
+        yield None
+        return
+    previous = tree.nodes.active
+    viewer = tree.nodes.new("CompositorNodeViewer")
+    viewer.name = "AperturiaFX_StreamTap"
+    tree.links.new(source, viewer.inputs[0])
+    tree.nodes.active = viewer
+    try:
+        yield viewer
+    finally:
+        tree.nodes.remove(viewer)
+        if previous is not None:
+            tree.nodes.active = previous
+
+def stream_render(scene, report=None):
+    settings = scene.aperturia
+    width, height = render_size(scene)
+    fps = scene.render.fps / scene.render.fps_base
+    output = bpy.path.abspath(settings.stream_path)
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+
+    with viewer_tap(scene) as viewer:
+        if viewer is None:
+            raise RuntimeError("Streaming needs compositing enabled with a connected Composite node.")
+        stream = FrameStream(encoder_command(settings, width, height, fps, output),
+                             width, height, settings.stream_queue, output + ".log")
+
+        pixels = np.empty((width * height, 4), dtype=np.float32)
+        # scratch file for the view transform, kept out of the output folder
+        encode_path = os.path.join(bpy.app.tempdir, STREAM_ENCODED + ".png")
+        apply_post = settings.use_post_hook and not group_is_wired(scene)
+        frame_start, frame_end = scene.frame_start, scene.frame_end
+        wm = bpy.context.window_manager
+        wm.progress_begin(frame_start, frame_end)
+        post_state["streaming"] = True
+        try:
+            if apply_post:
+                post_processor.configure_frame_cache(settings)
+                post_processor.begin(scene, width, height)
+            for frame in range(frame_start, frame_end + 1):
+                scene.frame_set(frame)
+                bpy.ops.render.render(scene=scene.name, write_still=settings.stream_keep_frames)
+                img = bpy.data.images.get("Viewer Node")
+                if img is None or tuple(img.size) != (width, height):
+                    raise RuntimeError(f"Viewer output does not match {width}x{height} on frame {frame}")
+                img.pixels.foreach_get(pixels.reshape(-1))
+
+                if apply_post:
+                    np.copyto(post_processor.buf.reshape(-1, 4), pixels)
+                    post_processor.run(group_parameters(scene), frame)
+                    np.copyto(pixels, post_processor.buf.reshape(-1, 4))
+
+                display_encode(scene, pixels, width, height, encode_path)
+                stream.push(pixels)
+                wm.progress_update(frame)
+                if report:
+                    report(f"streamed frame {frame}")
+        finally:
+            error = stream.close()
+            wm.progress_end()
+            post_state["streaming"] = False
+            if apply_post:
+                post_processor.end()
+            if os.path.exists(encode_path):
+                os.remove(encode_path)
+
+    if error:
+        raise RuntimeError(f"{error}, see {output}.log")
+    return output
+
+# === PARAMETER SWEEP ===
+# Renders every combination of the swept sliders through the group itself, so
+# the sheet shows the real look. The scene is rendered once for the source
+# frame and one bench scene is reused for all variants: each variant is then a
+# compositor-only run at the render resolution, area-averaged down to a
+# thumbnail. Variants that resolve to the same group inputs render once.
+#
+# Axis values are clamped to the input's min/max on the group interface, so the
+# default 0 to 1 covers each slider's own range. Fingerprint and Smudge level
+# only add level * heavy overlay (times the intensity) to the group output, so
+# swept levels are rendered at 0 and added back per thumbnail from one
+# difference render per overlay.
+
+# settings attribute, group input
+sweep_inputs = (
+    ("sweep_era", "Camera Era"),
+    ("sweep_distortion", "Lens Distortion"),
+    ("sweep_fingerprint", "Fingerprint level"),
+    ("sweep_smudge", "Smudge level"),
+    ("sweep_noise", "General Noise"),
+)
+
+# level input, the intensity input that gates it in the group
+overlay_gates = (
+    ("Fingerprint level", "Fingerprint intensity"),
+    ("Smudge level", "Smudge intensity"),
+)
+
+def input_range(name):
+    group = bpy.data.node_groups.get("Aperturia FX")
+    if group:
+        for item in group.interface.items_tree:
+            if item.item_type == 'SOCKET' and item.in_out == 'INPUT' and item.name == name:
+                return item.min_value, item.max_value
+    return -np.inf, np.inf
+
+def sweep_variants(settings, base_params):
+    axes = []
+    for attr, name in sweep_inputs:
+        axis = getattr(settings, attr)
+        if axis.use:
+            start, end = np.clip((axis.start, axis.end), *input_range(name)).tolist()
+            values = np.linspace(start, end, axis.steps).tolist() if axis.steps > 1 else [start]
+            axes.append((name, values))
+
+    for combo in itertools.product(*(values for _, values in axes)):
+        params = dict(base_params)
+        params.update(zip((name for name, _ in axes), combo))
+        yield params
+
+def sweep_warnings(settings, base_params):
+    warnings = []
+    for attr, name in sweep_inputs:
+        for level, intensity in overlay_gates:
+            if name == level and getattr(settings, attr).use and base_params.get(intensity, 0.0) <= 0.0:
+                warnings.append(f"{level} has no visible effect while {intensity} is 0")
+    return warnings
+
+def effective_params(params):
+    # Overlay levels only matter when their intensity is above zero
+    key = dict(params)
+    for level, intensity in overlay_gates:
+        if key.get(intensity, 0.0) <= 0.0:
+            key[level] = 0.0
+    return json.dumps(key, sort_keys=True)
+
+def sweep_source_image(scene):
+    settings = scene.aperturia
+    if settings.sample_image:
+        return settings.sample_image
+
+    with viewer_tap(scene, raw=True) as viewer:
+        if viewer is None:
+            raise RuntimeError("Set a Sample Frame or enable compositing with a Render Layers node.")
+        bpy.ops.render.render(scene=scene.name)
+
+    # Viewer Node images cannot feed an Image node, so the pixels are copied
+    pixels = read_viewer_pixels()
+    if pixels is None:
+        raise RuntimeError("The raw render did not reach the Viewer node.")
+    height, width = pixels.shape[:2]
+    name = "AperturiaFX_SweepSource"
+    img = bpy.data.images.get(name)
+    if img and tuple(img.size) != (width, height):
+        bpy.data.images.remove(img)
+        img = None
+    if img is None:
+        img = bpy.data.images.new(name, width, height, float_buffer=True)
+    img.pixels.foreach_set(pixels.reshape(-1))
+    return img
+
+def area_downscale(pixels, width, height):
+    # Mean over the source pixels each thumbnail pixel covers
+    src_h, src_w = pixels.shape[:2]
+    rows = np.minimum((np.arange(height) * src_h) // height, src_h - 1)
+    cols = np.minimum((np.arange(width) * src_w) // width, src_w - 1)
+    sums = np.add.reduceat(np.add.reduceat(pixels, rows, axis=0), cols, axis=1)
+    counts = np.diff(np.append(rows, src_h))[:, None] * np.diff(np.append(cols, src_w))[None, :]
+    return (sums / counts[..., None]).astype(np.float32)
+
+def build_contact_sheet(scene, report=None):
+    settings = scene.aperturia
+    source = sweep_source_image(scene)
+    full_w, full_h = source.size
+    width = max(1, int(full_w * settings.sweep_thumb_scale))
+    height = max(1, int(full_h * settings.sweep_thumb_scale))
+
+    base_params = group_parameters(scene)
+    variants = list(sweep_variants(settings, base_params))
+    # swept overlay levels whose intensity makes them visible
+    gates = dict(overlay_gates)
+    levels = [level for attr, level in sweep_inputs
+              if getattr(settings, attr).use and base_params.get(gates.get(level), 0.0) > 0.0]
+    cols = max(1, int(np.ceil(np.sqrt(len(variants)))))
+    rows = int(np.ceil(len(variants) / cols))
+    sheet = np.zeros((rows * height, cols * width, 4), dtype=np.float32)
+    sheet[..., 3] = 1.0
+
+    bench, fx = create_bench_scene(source, (full_w, full_h), find_aperturia_node(scene))
+    rendered = {}
+    pixels = None
+    legend = []
+
+    def render_thumb(params):
+        nonlocal pixels
+        key = effective_params(params)
+        if key not in rendered:
+            pixels = render_group_pixels(bench, fx, params, scene.frame_current, pixels)
+            rendered[key] = area_downscale(pixels, width, height)
+        return rendered[key]
+
+    try:
+        flat = dict(base_params, **{level: 0.0 for level in levels})
+        overlays = {level: render_thumb(dict(flat, **{level: 1.0})) - render_thumb(flat) for level in levels}
+        for i, params in enumerate(variants):
+            thumb = render_thumb(dict(params, **{level: 0.0 for level in levels}))
+            if levels:
+                thumb = thumb + sum(params[level] * overlays[level] for level in levels)
+
+            row, col = divmod(i, cols)
+            y = (rows - 1 - row) * height  # first variant top-left, rows are stored bottom-up
+            sheet[y:y + height, col * width:(col + 1) * width] = thumb
+            swept = {name: round(params[name], 4) for _, name in sweep_inputs if name in params}
+            legend.append({"row": row, "col": col, **swept})
+            if report:
+                report(f"variant {i + 1}/{len(variants)}: {swept}")
+    finally:
+        remove_bench_scene()
+
+    name = "AperturiaFX_ContactSheet"
+    img = bpy.data.images.get(name)
+    if img and tuple(img.size) != (sheet.shape[1], sheet.shape[0]):
+        bpy.data.images.remove(img)
+        img = None
+    if img is None:
+        img = bpy.data.images.new(name, sheet.shape[1], sheet.shape[0], float_buffer=True)
+    img.pixels.foreach_set(sheet.reshape(-1))
+    img["aperturia_variants"] = json.dumps(legend)
+    return img, legend
+
+# === RENDER COST MODEL ===
+# Calibrated once per machine by timing the group at two resolutions for the
+# Camera Era anchors, plus single runs that isolate Image Scale, overlays and
+# the Glare/Denoise share. Estimates read the group instance's inputs per frame,
+# including animation, and the group's current quality settings.
+
+cost_eras = (0.0, 0.5, 1.0)
+cost_resolutions = ((480, 270), (960, 540))
+
+def get_cost_model_path():
+    config_dir = bpy.utils.user_resource('CONFIG', path="aperturia_fx", create=True)
+    return os.path.join(config_dir, "cost_model.json")
+
+def load_cost_model():
+    path = get_cost_model_path()
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f).get(platform.node())
+
+def save_cost_model(model):
+    path = get_cost_model_path()
+    models = {}
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            models = json.load(f)
+    models[platform.node()] = model
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(models, f, indent=2)
+    return path
+
+def calibrate_cost_model(repeats=2, report=None):
+    def measure(resolution, **inputs):
+        image = get_sample_image(bpy.context.scene, resolution)
+        bench, fx = create_bench_scene(image, resolution)
+        for name, value in inputs.items():
+            fx.inputs[name].default_value = value
+        seconds = time_group_render(bench, repeats)
+        if report:
+            report(f"{resolution[0]}x{resolution[1]} {inputs}: {seconds * 1000.0:.1f} ms")
+        return seconds
+
+    (w0, h0), (w1, h1) = cost_resolutions
+    mp0, mp1 = w0 * h0 / 1e6, w1 * h1 / 1e6
+    model = {"eras": {}, "created": time.time(), "blender": bpy.app.version_string}
+    applied = snapshot_quality_state()
+    try:
+        apply_quality_settings(quality_levels[0])
+        for era in cost_eras:
+            t0 = measure((w0, h0), **{"Camera Era": era})
+            t1 = measure((w1, h1), **{"Camera Era": era})
+            slope = max(0.0, (t1 - t0) / (mp1 - mp0))
+            model["eras"][str(era)] = {"base": max(0.0, t0 - slope * mp0), "per_mp": slope}
+
+        full = measure((w1, h1), **{"Camera Era": 1.0})
+        half_scale = measure((w1, h1), **{"Camera Era": 1.0, "Image Scale": 50.0})
+        overlays = measure((w1, h1), **{"Camera Era": 1.0, "Fingerprint intensity": 0.01, "Smudge intensity": 0.01})
+        apply_quality_settings(quality_levels[-1])
+        draft = measure((w1, h1), **{"Camera Era": 1.0})
+    finally:
+        restore_quality_state(applied)
+        remove_bench_scene()
+
+    model["half_scale_ratio"] = half_scale / full if full else 1.0
+    model["overlay_per_mp"] = max(0.0, (overlays - full) / mp1)
+    model["heavy_per_mp"] = max(0.0, (full - draft) / mp1)
+    return model
+
+def animated_inputs(scene, node, frame):
+    values = group_parameters(scene, node)
+    anim = scene.node_tree.animation_data
+    if anim and anim.action:
+        for i, sock in enumerate(node.inputs):
+            fcurve = anim.action.fcurves.find(f'nodes["{node.name}"].inputs[{i}].default_value')
+            if fcurve:
+                values[sock.name] = fcurve.evaluate(frame)
+    return values
+
+def heavy_node_share(group):
+    # 1.0 when Glare/Denoise run as built, 0.0 when they are muted or at LOW
+    denoise = [n for n in group.nodes if n.bl_idname == "CompositorNodeDenoise"]
+    glare = [n for n in group.nodes if n.bl_idname == "CompositorNodeGlare"]
+    denoise_on = sum(not n.mute for n in denoise) / len(denoise) if denoise else 0.0
+    glare_q = sum(glare_rank[n.quality] / 2.0 for n in glare if not n.mute) / len(glare) if glare else 0.0
+    return 0.5 * denoise_on + 0.5 * glare_q
+
+def peak_buffer_channels(group):
+    # Walks the group in dependency order, keeping each output alive until its
+    # last consumer ran. Slider math (single values) costs nothing; the group's
+    # Image input is an image source like the texture and mask nodes.
+    generators = {"CompositorNodeTexture", "CompositorNodeImage", "CompositorNodeEllipseMask"}
+    incoming = {node.name: [] for node in group.nodes}
+    consumers = {}
+    for link in group.links:
+        incoming[link.to_node.name].append(link)
+        consumers.setdefault(link.from_socket.as_pointer(), set()).add(link.to_node.name)
+
+    order, done = [], set()
+    def visit(node):
+        if node.name in done:
+            return
+        done.add(node.name)
+        for link in incoming[node.name]:
+            visit(link.from_node)
+        order.append(node)
+    for node in group.nodes:
+        visit(node)
+
+    image_outputs = set()
+    alive = {}
+    current = peak = 0
+    for node in order:
+        if node.bl_idname == "NodeGroupInput":
+            outputs = [out for out in node.outputs if out.name == "Image"]
+        elif node.bl_idname in generators or any(link.from_socket.as_pointer() in image_outputs for link in incoming[node.name]):
+            outputs = list(node.outputs)
+        else:
+            outputs = []
+        for out in outputs:
+            image_outputs.add(out.as_pointer())
+            users = consumers.get(out.as_pointer())
+            if users:
+                channels = 1 if out.type == 'VALUE' else 4
+                alive[out.as_pointer()] = [channels, set(users)]
+                current += channels
+        peak = max(peak, current)
+        for link in incoming[node.name]:
+            entry = alive.get(link.from_socket.as_pointer())
+            if entry:
+                entry[1].discard(node.name)
+                if not entry[1]:
+                    current -= entry[0]
+                    del alive[link.from_socket.as_pointer()]
+    return peak
+
+def estimate_frame_cost(model, params, width, height, heavy_share, buffer_channels):
+    mp = width * height / 1e6
+    era = min(max(params.get("Camera Era", 1.0), 0.0), 1.0)
+    anchors = sorted((float(k), v) for k, v in model["eras"].items())
+    lo = max((a for a in anchors if a[0] <= era), key=lambda a: a[0], default=anchors[0])
+    hi = min((a for a in anchors if a[0] >= era), key=lambda a: a[0], default=anchors[-1])
+    t = 0.0 if hi[0] == lo[0] else (era - lo[0]) / (hi[0] - lo[0])
+    base = lo[1]["base"] + (hi[1]["base"] - lo[1]["base"]) * t
+    per_mp = lo[1]["per_mp"] + (hi[1]["per_mp"] - lo[1]["per_mp"]) * t
+
+    # Image Scale is clamped to downscaling. Cost is a fixed share plus a share
+    # that follows the scaled area, both fitted from the 50% measurement
+    x = min(max(params.get("Image Scale", 100.0) / 100.0, 0.0), 1.0)
+    fixed = min(max(1.0 - (1.0 - model["half_scale_ratio"]) / 0.75, 0.0), 1.0)
+    scale_factor = fixed + (1.0 - fixed) * x * x
+
+    seconds = base + per_mp * mp * scale_factor
+    if params.get("Fingerprint intensity", 0.0) > 0.0 or params.get("Smudge intensity", 0.0) > 0.0:
+        seconds += model["overlay_per_mp"] * mp
+    seconds -= model["heavy_per_mp"] * mp * (1.0 - heavy_share)
+
+    memory = buffer_channels * 4 * width * height
+    return max(seconds, 0.0), memory
+
+def estimate_render_cost(scene, frame_start=None, frame_end=None):
+    model = load_cost_model()
+    if model is None:
+        raise RuntimeError("No cost model for this machine, run Calibrate first.")
+    group = bpy.data.node_groups.get("Aperturia FX")
+    if group is None:
+        raise RuntimeError("Aperturia FX node group is missing.")
+
+    node = find_aperturia_node(scene)
+    width, height = render_size(scene)
+    heavy = heavy_node_share(group)
+    channels = peak_buffer_channels(group)
+    frame_start = scene.frame_start if frame_start is None else frame_start
+    frame_end = scene.frame_end if frame_end is None else frame_end
+
+    frames = []
+    for frame in range(frame_start, frame_end + 1):
+        params = animated_inputs(scene, node, frame) if node else group_parameters(scene)
+        seconds, memory = estimate_frame_cost(model, params, width, height, heavy, channels)
+        frames.append({"frame": frame, "seconds": seconds, "peak_memory_bytes": memory})
+
+    return {
+        "machine": platform.node(),
+        "scene": scene.name,
+        "resolution": [width, height],
+        "frame_start": frame_start,
+        "frame_end": frame_end,
+        "frames": frames,
+        "total_seconds": sum(f["seconds"] for f in frames),
+        "peak_memory_bytes": max((f["peak_memory_bytes"] for f in frames), default=0),
+    }
+
 # === CUSTOM NODE CLASSES ===
 
+class AperturiaSweepAxis(bpy.types.PropertyGroup):
+    use: bpy.props.BoolProperty(name="Sweep", default=False)
+    start: bpy.props.FloatProperty(name="From", default=0.0)
+    end: bpy.props.FloatProperty(name="To", default=1.0)
+    steps: bpy.props.IntProperty(name="Steps", default=5, min=1, max=50)
+
+
+class AperturiaSettings(bpy.types.PropertyGroup):
+    target_ms: bpy.props.FloatProperty(
+        name="Target (ms)",
+        description="Compositing time budget per frame at the scene resolution",
+        default=500.0, min=1.0,
+    )
+    sample_image: bpy.props.PointerProperty(
+        name="Sample Frame",
+        description="Frame used for benchmarking. A generated test image is used when empty",
+        type=bpy.types.Image,
+    )
+    bench_repeats: bpy.props.IntProperty(
+        name="Repeats",
+        description="Timed renders per candidate, the median is used",
+        default=3, min=1, max=10,
+    )
+    preset_name: bpy.props.StringProperty(
+        name="Preset Name",
+        default="Auto Tuned",
+    )
+    quality_settings: bpy.props.StringProperty(
+        name="Applied Quality",
+        description="Quality level last applied to the group, reapplied when the group is rebuilt",
+        options={'HIDDEN'},
+    )
+    reference_dir: bpy.props.StringProperty(
+        name="Reference Inputs",
+        description="Folder of reference frames. The sample frame is used when empty",
+        subtype='DIR_PATH',
+    )
+    regression_dir: bpy.props.StringProperty(
+        name="Golden Frames",
+        description="Folder holding golden outputs and the regression report",
+        default="//aperturia_regression/",
+        subtype='DIR_PATH',
+    )
+    use_post_hook: bpy.props.BoolProperty(
+        name="Apply After Render",
+        description="Run the Aperturia FX group on every written frame as it is saved, without editing the compositor. Image sequence outputs only",
+        default=False,
+    )
+    use_frame_cache: bpy.props.BoolProperty(
+        name="Cache Processed Frames",
+        description="Reuse the group's image work when a frame has the same pixels, sliders and quality settings as a cached one, for example held frames and static turntables. Only the frame-driven compression noise is rendered again",
+        default=False,
+    )
+    frame_cache_size: bpy.props.IntProperty(
+        name="Cached Frames",
+        description="Frames kept in memory",
+        default=8, min=1, max=256,
+    )
+    frame_cache_dir: bpy.props.StringProperty(
+        name="Disk Cache",
+        description="Optional folder that also keeps cached frames between sessions",
+        subtype='DIR_PATH',
+    )
+    frame_cache_disk_size: bpy.props.IntProperty(
+        name="Disk Frames",
+        description="Frames kept in the disk cache",
+        default=64, min=1, max=100000,
+    )
+    sweep_era: bpy.props.PointerProperty(type=AperturiaSweepAxis)
+    sweep_distortion: bpy.props.PointerProperty(type=AperturiaSweepAxis)
+    sweep_fingerprint: bpy.props.PointerProperty(type=AperturiaSweepAxis)
+    sweep_smudge: bpy.props.PointerProperty(type=AperturiaSweepAxis)
+    sweep_noise: bpy.props.PointerProperty(type=AperturiaSweepAxis)
+    sweep_thumb_scale: bpy.props.FloatProperty(
+        name="Thumbnail Scale",
+        description="Size of each variant on the sheet. Variants are always rendered at full resolution and scaled down",
+        default=0.25, min=0.05, max=1.0, subtype='FACTOR',
+    )
+    stream_path: bpy.props.StringProperty(
+        name="Video",
+        description="Encoded output file",
+        default="//aperturia_stream.mp4",
+        subtype='FILE_PATH',
+    )
+    ffmpeg_path: bpy.props.StringProperty(
+        name="Encoder",
+        description="ffmpeg executable",
+        default="ffmpeg",
+        subtype='FILE_PATH',
+    )
+    ffmpeg_args: bpy.props.StringProperty(
+        name="Encoder Args",
+        description="Output options passed to the encoder",
+        default="-c:v libx264 -pix_fmt yuv420p -crf 18",
+    )
+    stream_queue: bpy.props.IntProperty(
+        name="Queued Frames",
+        description="Frames allowed to wait for the encoder before rendering pauses",
+        default=4, min=1, max=64,
+    )
+    stream_keep_frames: bpy.props.BoolProperty(
+        name="Keep Frame Files",
+        description="Also write each frame to the scene output path",
+        default=False,
+    )
+
+
+class APERTURIA_OT_AutoTune(bpy.types.Operator):
+    bl_idname = "aperturia.auto_tune"
+    bl_label = "Tune to Frame Budget"
+    bl_description = "Benchmarks quality levels on a sample frame and applies the best one that fits the target time"
+
+    @classmethod
+    def poll(cls, context):
+        return "Aperturia FX" in bpy.data.node_groups
+
+    def execute(self, context):
+        settings = context.scene.aperturia
+        (level, ms), results = auto_tune(
+            context.scene, settings.target_ms, settings.bench_repeats,
+            report=lambda msg: print(f"Aperturia tuner: {msg}"),
+        )
+        path = save_quality_preset(settings.preset_name, level, {
+            "target_ms": settings.target_ms,
+            "measured_ms": ms,
+            "resolution": list(render_size(context.scene)),
+        })
+
+        if ms > settings.target_ms:
+            self.report({'WARNING'}, f"No level fits {settings.target_ms:.0f} ms, applied '{level['name']}' ({ms:.0f} ms)")
+        else:
+            self.report({'INFO'}, f"Applied '{level['name']}' ({ms:.0f} ms), saved to {path}")
+        return {'FINISHED'}
+
+
+preset_enum_items = []  # Blender needs the dynamic enum items to stay referenced
+
+def quality_preset_items(self, context):
+    preset_enum_items.clear()
+    for name in list_quality_presets():
+        preset_enum_items.append((name, name, ""))
+    return preset_enum_items
+
+
+class APERTURIA_OT_ApplyQualityPreset(bpy.types.Operator):
+    bl_idname = "aperturia.apply_quality_preset"
+    bl_label = "Apply Quality Preset"
+    bl_description = "Applies a saved quality preset to the Aperturia FX node group"
+
+    preset: bpy.props.EnumProperty(name="Preset", items=quality_preset_items)
+
+    def execute(self, context):
+        path = list_quality_presets().get(self.preset)
+        if not path:
+            self.report({'WARNING'}, "No saved quality presets found.")
+            return {'CANCELLED'}
+        data = load_quality_preset(path)
+        if not apply_quality_settings(data["settings"]):
+            self.report({'WARNING'}, "Aperturia FX node group is missing.")
+            return {'CANCELLED'}
+        store_quality_settings(context.scene, data["settings"])
+        self.report({'INFO'}, f"Applied quality preset '{self.preset}'.")
+        return {'FINISHED'}
+
+
+class APERTURIA_OT_Regression(bpy.types.Operator):
+    bl_idname = "aperturia.regression"
+    bl_label = "Run Regression"
+    bl_description = "Records golden frames or compares the current group against them"
+
+    mode: bpy.props.EnumProperty(
+        name="Mode",
+        items=[
+            ('RECORD', "Record Golden", "Render reference inputs at Full quality and store them as golden frames"),
+            ('COMPARE', "Compare", "Render every quality level and report PSNR/SSIM and time against the golden frames"),
+        ],
+        default='COMPARE',
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return "Aperturia FX" in bpy.data.node_groups
+
+    def execute(self, context):
+        rows, path = run_regression(
+            context.scene, self.mode,
+            report=lambda msg: print(f"Aperturia regression: {msg}"),
+        )
+        failed = [row for row in rows if "error" in row]
+        if failed:
+            self.report({'WARNING'}, f"{len(failed)} of {len(rows)} cases could not be compared, see {path}")
+        else:
+            self.report({'INFO'}, f"{len(rows)} cases written to {path}")
+        return {'FINISHED'}
+
+class APERTURIA_OT_StreamRender(bpy.types.Operator):
+    bl_idname = "aperturia.stream_render"
+    bl_label = "Render and Stream"
+    bl_description = "Renders the frame range and pipes the composited frames straight into the encoder"
+
+    def execute(self, context):
+        try:
+            output = stream_render(context.scene)
+        except (OSError, RuntimeError) as e:
+            self.report({'ERROR'}, str(e))
+            return {'CANCELLED'}
+        self.report({'INFO'}, f"Encoded {output}")
+        return {'FINISHED'}
+
+
+class APERTURIA_OT_Sweep(bpy.types.Operator):
+    bl_idname = "aperturia.sweep"
+    bl_label = "Render Contact Sheet"
+    bl_description = "Renders every combination of the swept sliders for the current frame into one contact sheet image"
+
+    def execute(self, context):
+        settings = context.scene.aperturia
+        warnings = sweep_warnings(settings, group_parameters(context.scene))
+        try:
+            img, legend = build_contact_sheet(context.scene)
+        except RuntimeError as e:
+            self.report({'ERROR'}, str(e))
+            return {'CANCELLED'}
+        for warning in warnings:
+            self.report({'WARNING'}, warning)
+        self.report({'INFO'}, f"{len(legend)} variants written to '{img.name}'")
+        return {'FINISHED'}
+
+
+class APERTURIA_OT_CalibrateCost(bpy.types.Operator):
+    bl_idname = "aperturia.calibrate_cost"
+    bl_label = "Calibrate Cost Model"
+    bl_description = "Runs a short benchmark and stores this machine's render-cost model"
+
+    @classmethod
+    def poll(cls, context):
+        return "Aperturia FX" in bpy.data.node_groups
+
+    def execute(self, context):
+        model = calibrate_cost_model(report=lambda msg: print(f"Aperturia calibration: {msg}"))
+        path = save_cost_model(model)
+        self.report({'INFO'}, f"Cost model saved to {path}")
+        return {'FINISHED'}
+
+
+class APERTURIA_OT_ExportCost(bpy.types.Operator, ExportHelper):
+    bl_idname = "aperturia.export_cost"
+    bl_label = "Export Cost Estimate"
+    bl_description = "Writes per-frame time and memory estimates for the scene's frame range as JSON"
+
+    filename_ext = ".json"
+    filter_glob: bpy.props.StringProperty(default="*.json", options={'HIDDEN'})
+
+    def execute(self, context):
+        try:
+            estimate = estimate_render_cost(context.scene)
+        except RuntimeError as e:
+            self.report({'ERROR'}, str(e))
+            return {'CANCELLED'}
+        with open(self.filepath, "w", encoding="utf-8") as f:
+            json.dump(estimate, f, indent=2)
+        self.report({'INFO'}, f"{estimate['total_seconds']:.1f} s estimated for {len(estimate['frames'])} frames")
+        return {'FINISHED'}
+
+
+class AperturiaPreferences(bpy.types.AddonPreferences):
+    bl_idname = __name__
+
+    metrics_log: bpy.props.StringProperty(
+        name="Metrics Log",
+        description="Append load and startup metrics to this file as JSON lines. APERTURIA_METRICS_LOG overrides it",
+        subtype='FILE_PATH',
+    )
+
+    def draw(self, context):
+        self.layout.prop(self, "metrics_log")
+
+
 class APERTURIA_OT_RefreshAll(bpy.types.Operator):
     bl_idname = "aperturia.refresh_all"
     bl_label = "Restore Aperturia FX"
     bl_description = "Checks and restores Aperturia FX and Lite node groups and textures"
 
     def execute(self, context):
-        restored_fx = False
-        restored_lite = False
-
-        # Standard FX check
-        try:
-            restored_fx = check_aperturia_integrity()
-        except Exception as e:
-            self.report({'WARNING'}, f"FX check failed: {e}")
+        restored = False
 
-        # Lite check (optional – define this in your Lite add-on)
+        # Covers every front-end registered with the shared runtime
         try:
-            from aperture_fx_lite import check_aperturia_lite_integrity  # Adjust import if needed
-            restored_lite = check_aperturia_lite_integrity()
-        except ImportError:
-            pass  # Lite not installed – no problem
+            restored = check_aperturia_integrity()
         except Exception as e:
-            self.report({'WARNING'}, f"Lite check failed: {e}")
+            self.report({'WARNING'}, f"Integrity check failed: {e}")
 
-        if restored_fx or restored_lite:
+        if restored:
             self.report({'INFO'}, "Aperturia FX and/or Lite were rebuilt.")
         else:
             self.report({'INFO'}, "All Aperturia components are already intact.")
@@ -900,6 +3093,73 @@ class APERTURIA_PT_Tools(bpy.types.Panel):
     def draw(self, context):
         layout = self.layout
         layout.operator("aperturia.refresh_all", icon='FILE_REFRESH')
+        warning = render_region_warning(context.scene)
+        if warning:
+            layout.label(text=warning, icon='ERROR')
+
+        settings = context.scene.aperturia
+        box = layout.box()
+        box.label(text="Frame Budget", icon='TIME')
+        box.prop(settings, "target_ms")
+        box.prop(settings, "sample_image")
+        box.prop(settings, "bench_repeats")
+        box.prop(settings, "preset_name")
+        box.operator("aperturia.auto_tune", icon='PLAY')
+        box.operator_menu_enum("aperturia.apply_quality_preset", "preset", icon='PRESET')
+
+        box = layout.box()
+        box.label(text="Regression", icon='IMAGE_REFERENCE')
+        box.prop(settings, "reference_dir")
+        box.prop(settings, "regression_dir")
+        row = box.row(align=True)
+        row.operator("aperturia.regression", text="Record Golden").mode = 'RECORD'
+        row.operator("aperturia.regression", text="Compare").mode = 'COMPARE'
+
+        box = layout.box()
+        box.label(text="Post-Render", icon='RENDER_RESULT')
+        box.prop(settings, "use_post_hook")
+        col = box.column()
+        col.active = settings.use_post_hook
+        warning = post_hook_warning(context.scene) if settings.use_post_hook else None
+        if warning:
+            col.label(text=warning, icon='ERROR')
+        col.prop(settings, "use_frame_cache")
+        sub = col.column()
+        sub.active = settings.use_frame_cache
+        sub.prop(settings, "frame_cache_size")
+        sub.prop(settings, "frame_cache_dir")
+        sub.prop(settings, "frame_cache_disk_size")
+
+        box = layout.box()
+        box.label(text="Look Sweep", icon='IMGDISPLAY')
+        for attr, name in sweep_inputs:
+            axis = getattr(settings, attr)
+            row = box.row(align=True)
+            row.prop(axis, "use", text=name)
+            sub = row.row(align=True)
+            sub.active = axis.use
+            sub.prop(axis, "start", text="")
+            sub.prop(axis, "end", text="")
+            sub.prop(axis, "steps", text="")
+        for warning in sweep_warnings(settings, group_parameters(context.scene)):
+            box.label(text=warning, icon='ERROR')
+        box.prop(settings, "sweep_thumb_scale")
+        box.operator("aperturia.sweep", icon='RENDER_STILL')
+
+        box = layout.box()
+        box.label(text="Render Cost", icon='SORTTIME')
+        row = box.row(align=True)
+        row.operator("aperturia.calibrate_cost", icon='TIME')
+        row.operator("aperturia.export_cost", icon='EXPORT')
+
+        box = layout.box()
+        box.label(text="Stream to Encoder", icon='FILE_MOVIE')
+        box.prop(settings, "stream_path")
+        box.prop(settings, "ffmpeg_path")
+        box.prop(settings, "ffmpeg_args")
+        box.prop(settings, "stream_queue")
+        box.prop(settings, "stream_keep_frames")
+        box.operator("aperturia.stream_render", icon='RENDER_ANIMATION')
 
 
 class CompositorNodeAperturiaFX(bpy.types.Node):
@@ -932,8 +3192,18 @@ node_categories = [
 # === REGISTER / UNREGISTER ===
 
 classes = (
+    AperturiaPreferences,
+    AperturiaSweepAxis,
+    AperturiaSettings,
     CompositorNodeAperturiaFX,
     APERTURIA_OT_RefreshAll,
+    APERTURIA_OT_AutoTune,
+    APERTURIA_OT_ApplyQualityPreset,
+    APERTURIA_OT_Regression,
+    APERTURIA_OT_StreamRender,
+    APERTURIA_OT_Sweep,
+    APERTURIA_OT_CalibrateCost,
+    APERTURIA_OT_ExportCost,
     APERTURIA_PT_Tools,
 )
 
@@ -941,33 +3211,65 @@ def register():
     for cls in classes:
         bpy.utils.register_class(cls)
 
+    bpy.types.Scene.aperturia = bpy.props.PointerProperty(type=AperturiaSettings)
+
     nodeitems_utils.register_node_categories("APERTURIA_FX", node_categories)
 
-    if on_file_load not in bpy.app.handlers.load_post:
-        bpy.app.handlers.load_post.append(on_file_load)
+    if on_render_write not in bpy.app.handlers.render_write:
+        bpy.app.handlers.render_write.append(on_render_write)
 
-    from bpy.app.timers import register as delay
+    for handlers in (bpy.app.handlers.render_complete, bpy.app.handlers.render_cancel):
+        if on_render_done not in handlers:
+            handlers.append(on_render_done)
 
-    def deferred_node_group_build():
-        ensure_aperturia_textures()
-        if "Aperturia FX" in bpy.data.node_groups:
-            bpy.data.node_groups.remove(bpy.data.node_groups["Aperturia FX"])
-        group, node_map = create_custom_node_group()
-        if group and node_map:
-            wire_custom_node_group(group, node_map)
-        return None
+    if not bpy.app.timers.is_registered(post_queue_timer):
+        bpy.app.timers.register(post_queue_timer, first_interval=1.0, persistent=True)
+
+    if on_render_pre not in bpy.app.handlers.render_pre:
+        bpy.app.handlers.render_pre.append(on_render_pre)
 
-    delay(deferred_node_group_build, first_interval=1.0)
+    for handlers in (bpy.app.handlers.render_post, bpy.app.handlers.render_cancel):
+        if on_render_post not in handlers:
+            handlers.append(on_render_post)
+
+    if on_depsgraph_update not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(on_depsgraph_update)
+
+    AperturiaRuntime.shared().register_frontend("Aperturia FX", "Aperturia FX", build_aperturia_group, ensure_aperturia_textures, metrics)
 
 
 def unregister():
     nodeitems_utils.unregister_node_categories("APERTURIA_FX")
 
+    del bpy.types.Scene.aperturia
+
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
 
-    if on_file_load in bpy.app.handlers.load_post:
-        bpy.app.handlers.load_post.remove(on_file_load)
+    AperturiaRuntime.shared().unregister_frontend("Aperturia FX")
+
+    if on_render_write in bpy.app.handlers.render_write:
+        bpy.app.handlers.render_write.remove(on_render_write)
+
+    for handlers in (bpy.app.handlers.render_complete, bpy.app.handlers.render_cancel):
+        if on_render_done in handlers:
+            handlers.remove(on_render_done)
+
+    if bpy.app.timers.is_registered(post_queue_timer):
+        bpy.app.timers.unregister(post_queue_timer)
+
+    if on_render_pre in bpy.app.handlers.render_pre:
+        bpy.app.handlers.render_pre.remove(on_render_pre)
+
+    for handlers in (bpy.app.handlers.render_post, bpy.app.handlers.render_cancel):
+        if on_render_post in handlers:
+            handlers.remove(on_render_post)
+
+    if on_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(on_depsgraph_update)
+
+    if bpy.app.timers.is_registered(deferred_color_noise_bake):
+        bpy.app.timers.unregister(deferred_color_noise_bake)
 
     if "Aperturia FX" in bpy.data.node_groups:
         bpy.data.node_groups.remove(bpy.data.node_groups["Aperturia FX"])
\ No newline at end of file